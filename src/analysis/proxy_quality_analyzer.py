@@ -25,6 +25,10 @@ from ..proxy_manager.models import ProxyNode, ProxyStatus, ProxyAnonymity, Proxy
 
 logger = logging.getLogger(__name__)
 
+# 評分分布區間下界（遞增），配合 np.searchsorted 一次完成分桶；標籤依桶序由低到高
+_SCORE_BUCKET_EDGES = np.array([60, 70, 80, 90])
+_SCORE_BUCKET_LABELS = ("很差 (0-59)", "較差 (60-69)", "一般 (70-79)", "良好 (80-89)", "優秀 (90-100)")
+
 
 @dataclass
 class QualityMetrics:
@@ -292,17 +296,17 @@ class ProxyQualityAnalyzer:
                 generated_at=datetime.now()
             )
         
-        # 計算統計數據
-        scores = [score.overall_score for score in quality_scores]
-        average_score = mean(scores)
+        # 計算統計數據：評分收集成連續陣列後向量化計算
+        scores = np.fromiter((score.overall_score for score in quality_scores),
+                             dtype=np.float64, count=len(quality_scores))
+        average_score = float(scores.mean())
         
-        # 評分分布
+        # 評分分布：一次分桶計數，按由高到低的順序輸出
+        bucket_counts = np.bincount(np.searchsorted(_SCORE_BUCKET_EDGES, scores, side='right'),
+                                    minlength=len(_SCORE_BUCKET_LABELS))
         score_distribution = {
-            "優秀 (90-100)": len([s for s in scores if s >= 90]),
-            "良好 (80-89)": len([s for s in scores if 80 <= s < 90]),
-            "一般 (70-79)": len([s for s in scores if 70 <= s < 80]),
-            "較差 (60-69)": len([s for s in scores if 60 <= s < 70]),
-            "很差 (0-59)": len([s for s in scores if s < 60])
+            label: int(bucket_counts[index])
+            for index, label in reversed(list(enumerate(_SCORE_BUCKET_LABELS)))
         }
         
         # 排序
@@ -334,18 +338,20 @@ class ProxyQualityAnalyzer:
         if average_score < 70:
             recommendations.append("整體代理品質較低，建議更新代理池")
         
-        # 分析各項指標
-        performance_scores = [s.performance_score for s in quality_scores]
-        reliability_scores = [s.reliability_score for s in quality_scores]
-        security_scores = [s.security_score for s in quality_scores]
+        # 分析各項指標：三項評分組成 (N, 3) 陣列，一次按列求平均
+        dimension_scores = np.array(
+            [(s.performance_score, s.reliability_score, s.security_score) for s in quality_scores],
+            dtype=np.float64
+        )
+        performance_mean, reliability_mean, security_mean = dimension_scores.mean(axis=0)
         
-        if mean(performance_scores) < 70:
+        if performance_mean < 70:
             recommendations.append("代理性能普遍較差，建議優化網路配置")
         
-        if mean(reliability_scores) < 70:
+        if reliability_mean < 70:
             recommendations.append("代理可靠性不足，建議增加穩定性檢查")
         
-        if mean(security_scores) < 70:
+        if security_mean < 70:
             recommendations.append("代理安全性較低，建議使用高匿名代理")
         
         return recommendations
@@ -13,19 +13,40 @@
 創建時間: 2024
 """
 
+import copy
 import os
+import struct
 import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from multiprocessing.shared_memory import SharedMemory
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 import yaml
 from loguru import logger
 from pydantic import BaseModel, Field, validator
 
+try:  # 優先使用 libyaml C 擴展解析
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _YamlLoader
+
+try:  # msgpack 為可選依賴，缺少時不啟用共享記憶體配置
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
 # 添加項目根目錄到 Python 路徑
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+# 共享記憶體配置區塊：名稱按主進程 PID 區分，經環境變數傳給子進程；
+# 長度標頭用於截取有效內容（SharedMemory 會按頁大小補齊）
+SHARED_CONFIG_PREFIX = "proxy_cfg"
+SHARED_CONFIG_ENV = "PROXY_SHARED_CONFIG"
+_SHM_HEADER = struct.Struct("<I")
+
 
 class ServerConfig(BaseModel):
     """服務器配置模型"""
@@ -243,8 +264,523 @@ class AppConfig(BaseModel):
     feature_flags: Dict[str, bool] = Field(default_factory=dict)
 
 
+# 默認配置；YAML 與環境變數僅需覆蓋差異部分
+_DEFAULT_CONFIG_DICT: Dict[str, Any] = {
+    'server': {
+        'host': '0.0.0.0',
+        'environment': 'development',
+        'debug': True
+    },
+    'main_api': {
+        'port': 8000,
+        'workers': 1,
+        'reload': True,
+        'log_level': 'info',
+        'access_log': True
+    },
+    'etl_api': {
+        'port': 8001,
+        'workers': 1,
+        'reload': True,
+        'log_level': 'info',
+        'access_log': True
+    },
+    # monitoring 同時供 AppConfig.monitoring（APIConfig）與
+    # AppConfig.monitoring_config（alias="monitoring"）使用
+    'monitoring': {
+        'port': 8002,
+        'workers': 1,
+        'reload': True,
+        'log_level': 'info',
+        'access_log': True,
+        'metrics': {
+            'enabled': True,
+            'collection_interval': 60,
+            'retention_days': 30
+        },
+        'alerts': {
+            'enabled': True,
+            'email_notifications': False,
+            'webhook_url': None,
+            'rules': []
+        }
+    },
+    'database': {
+        'postgresql': {
+            'host': 'localhost',
+            'port': 5432,
+            'database': 'proxy_manager',
+            'username': 'postgres',
+            'password': 'password',
+            'pool_size': 10,
+            'max_overflow': 20,
+            'pool_timeout': 30,
+            'pool_recycle': 3600
+        },
+        'redis': {
+            'host': 'localhost',
+            'port': 6379,
+            'database': 0,
+            'password': None,
+            'max_connections': 10,
+            'socket_timeout': 5,
+            'socket_connect_timeout': 5
+        }
+    },
+    'etl': {
+        'batch_size': 1000,
+        'max_workers': 4,
+        'timeout': 300,
+        'retry_attempts': 3,
+        'retry_delay': 5,
+        'validation': {
+            'strict_mode': True,
+            'max_errors': 100,
+            'error_threshold': 0.05
+        },
+        'scheduler': {
+            'enabled': True,
+            'interval': 3600,
+            'max_concurrent_jobs': 2
+        }
+    },
+    'proxy': {
+        'validation': {
+            'timeout': 10,
+            'test_urls': [
+                'http://httpbin.org/ip',
+                'https://httpbin.org/ip',
+                'http://icanhazip.com'
+            ],
+            'max_concurrent': 50
+        },
+        'scoring': {
+            'speed_weight': 0.4,
+            'reliability_weight': 0.3,
+            'anonymity_weight': 0.2,
+            'location_weight': 0.1
+        },
+        'filtering': {
+            'min_speed': 1.0,
+            'min_reliability': 0.8,
+            'required_anonymity': 'anonymous'
+        }
+    },
+    'logging': {
+        'level': 'INFO',
+        'format': '<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>',
+        'file': {
+            'enabled': True,
+            'path': 'logs',
+            'rotation': '1 day',
+            'retention': '7 days',
+            'compression': 'gz'
+        },
+        'console': {
+            'enabled': True,
+            'colorize': True
+        }
+    },
+    'security': {
+        'cors': {
+            'allow_origins': [
+                'http://localhost:3000',
+                'http://localhost:8080',
+                'http://127.0.0.1:3000',
+                'http://127.0.0.1:8080'
+            ],
+            'allow_methods': ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
+            'allow_headers': ['*'],
+            'allow_credentials': True
+        },
+        'api_keys': {
+            'enabled': False,
+            'header_name': 'X-API-Key',
+            'keys': []
+        },
+        'rate_limiting': {
+            'enabled': True,
+            'requests_per_minute': 100,
+            'burst_size': 10
+        }
+    },
+    'feature_flags': {
+        'etl_pipeline': True,
+        'monitoring_dashboard': True,
+        'api_documentation': True,
+        'metrics_export': True,
+        'data_validation': True,
+        'proxy_rotation': True,
+        'geo_filtering': True,
+        'speed_testing': True
+    }
+}
+
+
+# 環境變數類型轉換查表：布林真值集合與常用端口
+_BOOL_TRUE = frozenset({"true", "1", "yes"})
+_PORT_CACHE: Dict[str, int] = {str(p): p for p in (8000, 8001, 8002, 5432, 6379, 80, 443, 8080)}
+
+
+def _parse_bool(value: str) -> bool:
+    """解析布林型環境變數"""
+    return value.lower() in _BOOL_TRUE
+
+
+def _parse_port(value: str) -> int:
+    """解析端口型環境變數，常用端口直接查表"""
+    port = _PORT_CACHE.get(value)
+    return port if port is not None else int(value)
+
+
+@dataclass(frozen=True, slots=True)
+class _EnvMapping:
+    """環境變數到配置路徑的映射"""
+    env_var: str
+    path: Tuple[str, ...]
+    convert: Callable[[str], Any] = str
+
+
+_ENV_MAPPINGS: Tuple[_EnvMapping, ...] = (
+    _EnvMapping('SERVER_HOST', ('server', 'host')),
+    _EnvMapping('SERVER_ENVIRONMENT', ('server', 'environment')),
+    _EnvMapping('SERVER_DEBUG', ('server', 'debug'), _parse_bool),
+    _EnvMapping('MAIN_API_PORT', ('main_api', 'port'), _parse_port),
+    _EnvMapping('ETL_API_PORT', ('etl_api', 'port'), _parse_port),
+    _EnvMapping('MONITORING_PORT', ('monitoring', 'port'), _parse_port),
+    _EnvMapping('DB_HOST', ('database', 'postgresql', 'host')),
+    _EnvMapping('DB_PORT', ('database', 'postgresql', 'port'), _parse_port),
+    _EnvMapping('DB_NAME', ('database', 'postgresql', 'database')),
+    _EnvMapping('DB_USER', ('database', 'postgresql', 'username')),
+    _EnvMapping('DB_PASSWORD', ('database', 'postgresql', 'password')),
+    _EnvMapping('REDIS_HOST', ('database', 'redis', 'host')),
+    _EnvMapping('REDIS_PORT', ('database', 'redis', 'port'), _parse_port),
+    _EnvMapping('REDIS_PASSWORD', ('database', 'redis', 'password')),
+)
+
+
+def _deep_merge(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    """深度合併配置字典
+
+    先複製一次 base，再將 overlay 逐層覆蓋進去；巢狀字典遞迴合併，
+    其他值（包含列表）直接以 overlay 取代。
+
+    Args:
+        base: 基礎配置（不會被修改）
+        overlay: 覆蓋配置
+
+    Returns:
+        合併後的新配置字典
+    """
+    merged = copy.deepcopy(base)
+    _merge_into(merged, overlay)
+    return merged
+
+
+def _merge_into(target: Dict[str, Any], overlay: Dict[str, Any]) -> None:
+    """將 overlay 就地合併進 target（容器值會被複製，overlay 不會被後續修改影響）"""
+    for key, value in overlay.items():
+        current = target.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            _merge_into(current, value)
+        elif isinstance(value, (dict, list)):
+            target[key] = copy.deepcopy(value)
+        else:
+            target[key] = value
+
+
+def _config_to_dict(config: AppConfig) -> Dict[str, Any]:
+    """將配置轉為可重新構建 AppConfig 的字典
+
+    monitoring 與 monitoring_config 共用同一個 "monitoring" 鍵，
+    這裡將兩者合併，避免 by_alias 導出時互相覆蓋。
+    """
+    data = config.model_dump()
+    monitoring_config = data.pop('monitoring_config')
+    data['monitoring'] = {**monitoring_config, **data['monitoring']}
+    return data
+
+
+# 配置日誌（模組載入時設置一次）
+logger.remove()
+logger.add(
+    sys.stdout,
+    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+    level="INFO"
+)
+
+# 配置世代號；reload_config 遞增，作為 load_config 的快取鍵
+_generation = 0
+
+
+def _resolve_config_path(config_path: Optional[Union[str, Path]] = None) -> Path:
+    """解析配置文件路徑"""
+    if config_path:
+        return Path(config_path)
+    
+    # 嘗試多個可能的配置文件位置
+    possible_paths = [
+        Path("config/server_config.yaml"),
+        Path("../config/server_config.yaml"),
+        Path("../../config/server_config.yaml"),
+        project_root / "config" / "server_config.yaml"
+    ]
+    
+    for path in possible_paths:
+        if path.exists():
+            return path.resolve()
+    
+    # 如果都找不到，返回默認路徑
+    return project_root / "config" / "server_config.yaml"
+
+
+@lru_cache(maxsize=1)
+def _resolved_config_path() -> Path:
+    """默認配置文件路徑（進程內只解析一次）"""
+    return _resolve_config_path()
+
+
+# 已解析的 YAML 快取：路徑 -> (mtime_ns, 數據)
+_YAML_CACHE: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+
+
+def _read_yaml(config_path: Path) -> Dict[str, Any]:
+    """讀取 YAML 配置文件，文件未變更時直接返回快取的解析結果
+    
+    返回值為共享快取，調用方不應修改（_deep_merge 會複製後再合併）。
+    """
+    mtime_ns = config_path.stat().st_mtime_ns
+    cached = _YAML_CACHE.get(config_path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    
+    with open(config_path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_YamlLoader) or {}
+    _YAML_CACHE[config_path] = (mtime_ns, data)
+    return data
+
+
+def _apply_env_overrides(config_data: Dict[str, Any]) -> Dict[str, Any]:
+    """應用環境變數覆蓋"""
+    for mapping in _ENV_MAPPINGS:
+        env_value = os.getenv(mapping.env_var)
+        if env_value is not None:
+            # 設置嵌套配置值
+            current = config_data
+            for key in mapping.path[:-1]:
+                if key not in current:
+                    current[key] = {}
+                current = current[key]
+            
+            # 類型轉換
+            current[mapping.path[-1]] = mapping.convert(env_value)
+            
+            logger.info(f"🔄 環境變數覆蓋: {mapping.env_var} -> {'.'.join(mapping.path)}")
+    
+    return config_data
+
+
+def _create_default_config() -> AppConfig:
+    """創建默認配置"""
+    return AppConfig(**_DEFAULT_CONFIG_DICT)
+
+
+def _load_config_file(config_path: Path) -> AppConfig:
+    """從配置文件加載配置（默認配置 → YAML → 環境變數）
+    
+    Args:
+        config_path: 配置文件路徑
+        
+    Returns:
+        應用程式配置對象，加載失敗時返回默認配置
+    """
+    try:
+        logger.info(f"📖 正在加載配置文件: {config_path}")
+        
+        if config_path.exists():
+            # 讀取 YAML 配置文件（未變更時使用快取）
+            yaml_data = _read_yaml(config_path)
+        else:
+            logger.warning(f"⚠️ 配置文件不存在: {config_path}")
+            logger.info("🔧 使用默認配置")
+            yaml_data = {}
+
+        # 在字典層合併默認配置與 YAML 覆蓋，部分配置文件也能正常加載
+        config_data = _deep_merge(_DEFAULT_CONFIG_DICT, yaml_data)
+
+        # 應用環境變數覆蓋
+        config_data = _apply_env_overrides(config_data)
+
+        # 驗證並創建配置對象（只進行一次 Pydantic 驗證）
+        config = AppConfig(**config_data)
+        
+        logger.info("✅ 配置加載成功")
+        return config
+        
+    except Exception as e:
+        logger.error(f"❌ 配置加載失敗: {e}")
+        logger.info("🔧 使用默認配置")
+        return _create_default_config()
+
+
+def _shared_config_name() -> str:
+    """當前進程作為主進程時使用的共享記憶體區塊名稱"""
+    return f"{SHARED_CONFIG_PREFIX}_{os.getpid()}"
+
+
+def _load_from_shared_memory() -> Optional[AppConfig]:
+    """嘗試從共享記憶體讀取主進程已解析的配置
+
+    只讀取主進程經 SHARED_CONFIG_ENV 指定的區塊，不會附加到其他進程遺留的區塊。
+
+    Returns:
+        配置對象，未指定區塊、區塊不存在或不可用時返回 None
+    """
+    name = os.environ.get(SHARED_CONFIG_ENV)
+    if msgpack is None or not name:
+        return None
+    
+    try:
+        shm = SharedMemory(name=name)
+    except FileNotFoundError:
+        return None
+    
+    try:
+        # 子進程與主進程共用 resource_tracker，區塊由主進程 release_shared_memory 回收
+        (size,) = _SHM_HEADER.unpack_from(shm.buf)
+        start = _SHM_HEADER.size
+        config_data = msgpack.unpackb(bytes(shm.buf[start:start + size]))
+        logger.info("📦 從共享記憶體加載配置")
+        return AppConfig(**config_data)
+    except Exception as e:
+        logger.warning(f"⚠️ 共享記憶體配置讀取失敗: {e}")
+        return None
+    finally:
+        shm.close()
+
+
+@lru_cache(maxsize=1)
+def load_config(_key: int = 0) -> AppConfig:
+    """加載配置（進程內單例）
+    
+    Args:
+        _key: 配置世代號；首次加載（0）時子進程優先從主進程預熱的
+            共享記憶體讀取，reload_config 之後一律重新解析配置文件
+            
+    Returns:
+        應用程式配置對象
+    """
+    if _key == 0:
+        shared_config = _load_from_shared_memory()
+        if shared_config is not None:
+            return shared_config
+    return _load_config_file(_resolved_config_path())
+
+
+def get_config() -> AppConfig:
+    """獲取應用程式配置"""
+    return load_config(_generation)
+
+
+def reload_config() -> AppConfig:
+    """重新加載配置"""
+    global _generation
+    load_config.cache_clear()
+    _generation += 1
+    return load_config(_generation)
+
+
+def prewarm_shared_memory(config: Optional[AppConfig] = None) -> Optional[SharedMemory]:
+    """將已解析配置寫入共享記憶體，供後續啟動的子進程直接讀取
+    
+    應由主進程在啟動服務進程前調用，並在停止時調用
+    release_shared_memory 釋放。
+    
+    Args:
+        config: 要寫入的配置，為 None 時使用 get_config()
+        
+    Returns:
+        共享記憶體對象，msgpack 不可用或創建失敗時返回 None
+    """
+    if msgpack is None:
+        logger.warning("⚠️ msgpack 未安裝，跳過共享記憶體配置預熱")
+        return None
+    
+    blob = msgpack.packb(_config_to_dict(config or get_config()))
+    name = _shared_config_name()
+    size = _SHM_HEADER.size + len(blob)
+    try:
+        shm = SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        # 名稱含本進程 PID，已存在的區塊只可能是同 PID 舊進程崩潰後遺留
+        logger.warning(f"⚠️ 共享記憶體 {name} 為遺留區塊，重新創建")
+        stale = SharedMemory(name=name)
+        stale.close()
+        stale.unlink()
+        shm = SharedMemory(name=name, create=True, size=size)
+    
+    _SHM_HEADER.pack_into(shm.buf, 0, len(blob))
+    shm.buf[_SHM_HEADER.size:_SHM_HEADER.size + len(blob)] = blob
+    os.environ[SHARED_CONFIG_ENV] = name
+    logger.info(f"📦 配置已寫入共享記憶體: {name} ({len(blob)} bytes)")
+    return shm
+
+
+def release_shared_memory(shm: Optional[SharedMemory]) -> None:
+    """釋放 prewarm_shared_memory 創建的共享記憶體"""
+    if shm is None:
+        return
+    if os.environ.get(SHARED_CONFIG_ENV) == shm.name:
+        del os.environ[SHARED_CONFIG_ENV]
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def save_config(config: AppConfig, config_path: Optional[Union[str, Path]] = None, backup: bool = True) -> bool:
+    """保存配置到文件
+    
+    Args:
+        config: 要保存的配置對象
+        config_path: 配置文件路徑，為 None 時使用默認路徑
+        backup: 是否創建備份
+        
+    Returns:
+        是否保存成功
+    """
+    path = Path(config_path) if config_path else _resolved_config_path()
+    try:
+        # 創建備份
+        if backup and path.exists():
+            backup_path = path.with_suffix('.yaml.bak')
+            backup_path.write_text(path.read_text(encoding='utf-8'), encoding='utf-8')
+            logger.info(f"📋 配置備份已創建: {backup_path}")
+        
+        # 確保目錄存在
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # 轉換為字典並保存
+        config_dict = config.dict(by_alias=True)
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            yaml.dump(config_dict, f, default_flow_style=False, allow_unicode=True, indent=2)
+        
+        logger.info(f"💾 配置已保存: {path}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ 配置保存失敗: {e}")
+        return False
+
+
 class ConfigLoader:
-    """配置加載器"""
+    """配置加載器（兼容舊接口）
+    
+    不持有配置狀態：未指定路徑時委派給模組級 get_config / reload_config，
+    指定路徑時每次直接解析該文件。
+    """
     
     def __init__(self, config_path: Optional[Union[str, Path]] = None):
         """初始化配置加載器
@@ -252,36 +788,12 @@ class ConfigLoader:
         Args:
             config_path: 配置文件路徑，如果為 None 則使用默認路徑
         """
-        self.config_path = self._resolve_config_path(config_path)
-        self._config: Optional[AppConfig] = None
-        
-        # 配置日誌
-        logger.remove()
-        logger.add(
-            sys.stdout,
-            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-            level="INFO"
-        )
-    
-    def _resolve_config_path(self, config_path: Optional[Union[str, Path]]) -> Path:
-        """解析配置文件路徑"""
-        if config_path:
-            return Path(config_path)
-        
-        # 嘗試多個可能的配置文件位置
-        possible_paths = [
-            Path("config/server_config.yaml"),
-            Path("../config/server_config.yaml"),
-            Path("../../config/server_config.yaml"),
-            project_root / "config" / "server_config.yaml"
-        ]
-        
-        for path in possible_paths:
-            if path.exists():
-                return path.resolve()
-        
-        # 如果都找不到，返回默認路徑
-        return project_root / "config" / "server_config.yaml"
+        self._explicit_path = Path(config_path) if config_path else None
+    
+    @property
+    def config_path(self) -> Path:
+        """配置文件路徑"""
+        return self._explicit_path or _resolved_config_path()
     
     def load_config(self, reload: bool = False) -> AppConfig:
         """加載配置
@@ -292,277 +804,28 @@ class ConfigLoader:
         Returns:
             應用程式配置對象
         """
-        if self._config is not None and not reload:
-            return self._config
-        
-        try:
-            logger.info(f"📖 正在加載配置文件: {self.config_path}")
-            
-            if not self.config_path.exists():
-                logger.warning(f"⚠️ 配置文件不存在: {self.config_path}")
-                logger.info("🔧 使用默認配置")
-                return self._create_default_config()
-            
-            # 讀取 YAML 配置文件
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config_data = yaml.safe_load(f)
-            
-            # 應用環境變數覆蓋
-            config_data = self._apply_env_overrides(config_data)
-            
-            # 驗證並創建配置對象
-            self._config = AppConfig(**config_data)
-            
-            logger.info("✅ 配置加載成功")
-            return self._config
-            
-        except Exception as e:
-            logger.error(f"❌ 配置加載失敗: {e}")
-            logger.info("🔧 使用默認配置")
-            return self._create_default_config()
-    
-    def _apply_env_overrides(self, config_data: Dict[str, Any]) -> Dict[str, Any]:
-        """應用環境變數覆蓋"""
-        # 定義環境變數映射
-        env_mappings = {
-            'SERVER_HOST': ['server', 'host'],
-            'SERVER_ENVIRONMENT': ['server', 'environment'],
-            'SERVER_DEBUG': ['server', 'debug'],
-            'MAIN_API_PORT': ['main_api', 'port'],
-            'ETL_API_PORT': ['etl_api', 'port'],
-            'MONITORING_PORT': ['monitoring', 'port'],
-            'DB_HOST': ['database', 'postgresql', 'host'],
-            'DB_PORT': ['database', 'postgresql', 'port'],
-            'DB_NAME': ['database', 'postgresql', 'database'],
-            'DB_USER': ['database', 'postgresql', 'username'],
-            'DB_PASSWORD': ['database', 'postgresql', 'password'],
-            'REDIS_HOST': ['database', 'redis', 'host'],
-            'REDIS_PORT': ['database', 'redis', 'port'],
-            'REDIS_PASSWORD': ['database', 'redis', 'password'],
-        }
-        
-        for env_var, config_path in env_mappings.items():
-            env_value = os.getenv(env_var)
-            if env_value is not None:
-                # 設置嵌套配置值
-                current = config_data
-                for key in config_path[:-1]:
-                    if key not in current:
-                        current[key] = {}
-                    current = current[key]
-                
-                # 類型轉換
-                final_key = config_path[-1]
-                if env_var.endswith('_PORT'):
-                    current[final_key] = int(env_value)
-                elif env_var.endswith('_DEBUG'):
-                    current[final_key] = env_value.lower() in ('true', '1', 'yes')
-                else:
-                    current[final_key] = env_value
-                
-                logger.info(f"🔄 環境變數覆蓋: {env_var} -> {'.'.join(config_path)}")
-        
-        return config_data
-    
-    def _create_default_config(self) -> AppConfig:
-        """創建默認配置"""
-        default_config = {
-            'server': {
-                'host': '0.0.0.0',
-                'environment': 'development',
-                'debug': True
-            },
-            'main_api': {
-                'port': 8000,
-                'workers': 1,
-                'reload': True,
-                'log_level': 'info',
-                'access_log': True
-            },
-            'etl_api': {
-                'port': 8001,
-                'workers': 1,
-                'reload': True,
-                'log_level': 'info',
-                'access_log': True
-            },
-            'monitoring': {
-                'port': 8002,
-                'workers': 1,
-                'reload': True,
-                'log_level': 'info',
-                'access_log': True
-            },
-            'database': {
-                'postgresql': {
-                    'host': 'localhost',
-                    'port': 5432,
-                    'database': 'proxy_manager',
-                    'username': 'postgres',
-                    'password': 'password',
-                    'pool_size': 10,
-                    'max_overflow': 20,
-                    'pool_timeout': 30,
-                    'pool_recycle': 3600
-                },
-                'redis': {
-                    'host': 'localhost',
-                    'port': 6379,
-                    'database': 0,
-                    'password': None,
-                    'max_connections': 10,
-                    'socket_timeout': 5,
-                    'socket_connect_timeout': 5
-                }
-            },
-            'etl': {
-                'batch_size': 1000,
-                'max_workers': 4,
-                'timeout': 300,
-                'retry_attempts': 3,
-                'retry_delay': 5,
-                'validation': {
-                    'strict_mode': True,
-                    'max_errors': 100,
-                    'error_threshold': 0.05
-                },
-                'scheduler': {
-                    'enabled': True,
-                    'interval': 3600,
-                    'max_concurrent_jobs': 2
-                }
-            },
-            'proxy': {
-                'validation': {
-                    'timeout': 10,
-                    'test_urls': [
-                        'http://httpbin.org/ip',
-                        'https://httpbin.org/ip',
-                        'http://icanhazip.com'
-                    ],
-                    'max_concurrent': 50
-                },
-                'scoring': {
-                    'speed_weight': 0.4,
-                    'reliability_weight': 0.3,
-                    'anonymity_weight': 0.2,
-                    'location_weight': 0.1
-                },
-                'filtering': {
-                    'min_speed': 1.0,
-                    'min_reliability': 0.8,
-                    'required_anonymity': 'anonymous'
-                }
-            },
-            'monitoring': {
-                'port': 8002,
-                'metrics': {
-                    'enabled': True,
-                    'collection_interval': 60,
-                    'retention_days': 30
-                },
-                'alerts': {
-                    'enabled': True,
-                    'email_notifications': False,
-                    'webhook_url': None,
-                    'rules': []
-                }
-            },
-            'logging': {
-                'level': 'INFO',
-                'format': '<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>',
-                'file': {
-                    'enabled': True,
-                    'path': 'logs',
-                    'rotation': '1 day',
-                    'retention': '7 days',
-                    'compression': 'gz'
-                },
-                'console': {
-                    'enabled': True,
-                    'colorize': True
-                }
-            },
-            'security': {
-                'cors': {
-                    'allow_origins': [
-                        'http://localhost:3000',
-                        'http://localhost:8080',
-                        'http://127.0.0.1:3000',
-                        'http://127.0.0.1:8080'
-                    ],
-                    'allow_methods': ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
-                    'allow_headers': ['*'],
-                    'allow_credentials': True
-                },
-                'api_keys': {
-                    'enabled': False,
-                    'header_name': 'X-API-Key',
-                    'keys': []
-                },
-                'rate_limiting': {
-                    'enabled': True,
-                    'requests_per_minute': 100,
-                    'burst_size': 10
-                }
-            },
-            'feature_flags': {
-                'etl_pipeline': True,
-                'monitoring_dashboard': True,
-                'api_documentation': True,
-                'metrics_export': True,
-                'data_validation': True,
-                'proxy_rotation': True,
-                'geo_filtering': True,
-                'speed_testing': True
-            }
-        }
-        
-        self._config = AppConfig(**default_config)
-        return self._config
+        if self._explicit_path is None:
+            return reload_config() if reload else get_config()
+        # 指定路徑時只以該文件為準，不讀取共享記憶體
+        return _load_config_file(self._explicit_path)
     
     def get_config(self) -> AppConfig:
         """獲取當前配置"""
-        if self._config is None:
-            return self.load_config()
-        return self._config
+        return self.load_config()
     
     def reload_config(self) -> AppConfig:
         """重新加載配置"""
         return self.load_config(reload=True)
     
+    def prewarm_shared_memory(self) -> Optional[SharedMemory]:
+        """將此加載器的配置寫入共享記憶體"""
+        return prewarm_shared_memory(self.get_config())
+    
+    release_shared_memory = staticmethod(release_shared_memory)
+    
     def save_config(self, config: AppConfig, backup: bool = True) -> bool:
-        """保存配置到文件
-        
-        Args:
-            config: 要保存的配置對象
-            backup: 是否創建備份
-            
-        Returns:
-            是否保存成功
-        """
-        try:
-            # 創建備份
-            if backup and self.config_path.exists():
-                backup_path = self.config_path.with_suffix('.yaml.bak')
-                backup_path.write_text(self.config_path.read_text(encoding='utf-8'), encoding='utf-8')
-                logger.info(f"📋 配置備份已創建: {backup_path}")
-            
-            # 確保目錄存在
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # 轉換為字典並保存
-            config_dict = config.dict(by_alias=True)
-            
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(config_dict, f, default_flow_style=False, allow_unicode=True, indent=2)
-            
-            logger.info(f"💾 配置已保存: {self.config_path}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ 配置保存失敗: {e}")
-            return False
+        """保存配置到此加載器的配置文件"""
+        return save_config(config, self.config_path, backup=backup)
     
     @staticmethod
     def create_default_config(config_path: str) -> bool:
@@ -575,34 +838,16 @@ class ConfigLoader:
             是否創建成功
         """
         try:
-            # 創建配置加載器實例
-            loader = ConfigLoader(config_path)
-            
-            # 生成默認配置
-            default_config = loader._create_default_config()
-            
-            # 保存配置
-            return loader.save_config(default_config, backup=False)
-            
+            return save_config(_create_default_config(), config_path, backup=False)
         except Exception as e:
             logger.error(f"❌ 創建默認配置失敗: {e}")
             return False
 
 
-# 全局配置加載器實例
+# 全局配置加載器（兼容舊接口，無狀態）
 config_loader = ConfigLoader()
 
 
-def get_config() -> AppConfig:
-    """獲取應用程式配置"""
-    return config_loader.get_config()
-
-
-def reload_config() -> AppConfig:
-    """重新加載配置"""
-    return config_loader.reload_config()
-
-
 if __name__ == "__main__":
     # 測試配置加載
     config = get_config()
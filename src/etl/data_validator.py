@@ -49,7 +49,13 @@ class ValidationResult(Enum):
     SUSPICIOUS = "suspicious"
 
 
-@dataclass
+# 常用的狀態集合，模組載入時建立一次，避免每次判斷都構造列表
+_PASSING_RESULTS = frozenset({ValidationResult.VALID, ValidationResult.WARNING})
+_CONNECTIVITY_LEVELS = frozenset({ValidationLevel.STANDARD, ValidationLevel.STRICT, ValidationLevel.COMPREHENSIVE})
+_ANONYMITY_LEVELS = frozenset({ValidationLevel.STRICT, ValidationLevel.COMPREHENSIVE})
+
+
+@dataclass(slots=True)
 class ValidationIssue:
     """驗證問題"""
     field: str
@@ -68,7 +74,7 @@ class ValidationIssue:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationReport:
     """驗證報告"""
     proxy_id: str
@@ -82,7 +88,7 @@ class ValidationReport:
     @property
     def is_valid(self) -> bool:
         """是否通過驗證"""
-        return self.overall_result in [ValidationResult.VALID, ValidationResult.WARNING]
+        return self.overall_result in _PASSING_RESULTS
     
     @property
     def has_errors(self) -> bool:
@@ -242,11 +248,11 @@ class ProxyDataValidator:
                 await self._check_duplicates(proxy, report)
             
             # 3. 連通性測試（如果需要）
-            if self.config.validation_level in [ValidationLevel.STANDARD, ValidationLevel.STRICT, ValidationLevel.COMPREHENSIVE]:
+            if self.config.validation_level in _CONNECTIVITY_LEVELS:
                 await self._validate_connectivity(proxy, report)
             
             # 4. 匿名性檢測（如果需要）
-            if self.config.validation_level in [ValidationLevel.STRICT, ValidationLevel.COMPREHENSIVE]:
+            if self.config.validation_level in _ANONYMITY_LEVELS:
                 await self._validate_anonymity(proxy, report)
             
             # 5. 性能測試（如果需要）
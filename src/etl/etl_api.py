@@ -15,9 +15,12 @@ ETL API 擴展模組
 """
 
 import asyncio
+import heapq
+from collections import Counter
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
+from itertools import chain
 from typing import Dict, List, Optional, Any, Union
 from uuid import uuid4
 
@@ -47,6 +50,10 @@ def get_db_config():
     return db_config
 
 
+# 驗證級別名稱查表（請求模型已驗證名稱，未知級別直接以 422 拒絕）
+_VALIDATION_LEVEL_BY_NAME: Dict[str, ValidationLevel] = {level.name: level for level in ValidationLevel}
+
+
 # ===== Pydantic 模型定義 =====
 
 class ETLJobRequest(BaseModel):
@@ -85,6 +92,12 @@ class ValidationRequest(BaseModel):
     validation_level: str = Field("STANDARD", description="驗證級別")
     sample_size: Optional[int] = Field(None, ge=1, le=10000, description="樣本大小")
     include_details: bool = Field(True, description="包含詳細信息")
+    
+    @validator('validation_level')
+    def validate_level(cls, v):
+        if v.upper() not in _VALIDATION_LEVEL_BY_NAME:
+            raise ValueError(f"驗證級別必須是 {list(_VALIDATION_LEVEL_BY_NAME)} 之一")
+        return v.upper()
 
 
 class ValidationResponse(BaseModel):
@@ -141,6 +154,9 @@ class ETLAPIManager:
         self.schema_manager = None
         self.active_jobs: Dict[str, Dict[str, Any]] = {}
         self.job_history: List[Dict[str, Any]] = []
+        # 歷史作業的二級索引：按 ID 查找與按狀態計數，避免每次掃描整個歷史
+        self._history_by_id: Dict[str, Dict[str, Any]] = {}
+        self._history_status_counts: Counter = Counter()
         
     async def initialize(self):
         """初始化所有組件"""
@@ -232,7 +248,7 @@ class ETLAPIManager:
                 job_info["error_message"] = result.error_message
             
             # 移動到歷史記錄
-            self.job_history.append(job_info.copy())
+            self._archive_job(job_info)
             del self.active_jobs[job_id]
             
             logger.info(f"✅ ETL 作業完成: {job_id}")
@@ -246,6 +262,17 @@ class ETLAPIManager:
             logger.error(f"❌ ETL 作業失敗: {job_id} - {e}")
             return False
     
+    def _archive_job(self, job_info: Dict[str, Any]) -> None:
+        """將作業快照加入歷史記錄並更新索引"""
+        snapshot = job_info.copy()
+        self.job_history.append(snapshot)
+        self._history_by_id[snapshot["job_id"]] = snapshot
+        self._history_status_counts[snapshot["status"]] += 1
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """按 ID 查找活躍或歷史作業"""
+        return self.active_jobs.get(job_id) or self._history_by_id.get(job_id)
+    
     async def validate_data(self, request: ValidationRequest) -> ValidationReport:
         """執行數據驗證"""
         try:
@@ -253,7 +280,7 @@ class ETLAPIManager:
             # 在實際實現中，這裡會從指定的數據源獲取數據
             sample_data = []  # 這裡應該從數據源獲取實際數據
             
-            validation_level = ValidationLevel[request.validation_level]
+            validation_level = _VALIDATION_LEVEL_BY_NAME[request.validation_level]
             
             # 執行驗證
             report = await self.data_validator.validate_batch(
@@ -289,8 +316,8 @@ class ETLAPIManager:
     def _get_etl_metrics(self) -> Dict[str, Any]:
         """獲取 ETL 指標"""
         active_jobs_count = len(self.active_jobs)
-        completed_jobs_count = len([job for job in self.job_history if job["status"] == "COMPLETED"])
-        failed_jobs_count = len([job for job in self.job_history if job["status"] == "FAILED"])
+        completed_jobs_count = self._history_status_counts["COMPLETED"]
+        failed_jobs_count = self._history_status_counts["FAILED"]
         
         return {
             "active_jobs": active_jobs_count,
@@ -388,16 +415,7 @@ async def get_etl_job(
 ):
     """獲取指定 ETL 作業的狀態和進度"""
     try:
-        # 檢查活躍作業
-        if job_id in manager.active_jobs:
-            job_info = manager.active_jobs[job_id]
-        else:
-            # 檢查歷史記錄
-            job_info = next(
-                (job for job in manager.job_history if job["job_id"] == job_id),
-                None
-            )
-            
+        job_info = manager.get_job(job_id)
         if not job_info:
             raise HTTPException(status_code=404, detail="作業不存在")
         
@@ -428,17 +446,16 @@ async def list_etl_jobs(
 ):
     """獲取所有 ETL 作業列表"""
     try:
-        all_jobs = list(manager.active_jobs.values()) + manager.job_history
+        # 惰性遍歷活躍作業與歷史記錄，不拼接完整列表
+        jobs = chain(manager.active_jobs.values(), manager.job_history)
         
         # 狀態篩選
         if status:
-            all_jobs = [job for job in all_jobs if job["status"].upper() == status.upper()]
-        
-        # 按創建時間排序（最新的在前）
-        all_jobs.sort(key=lambda x: x["created_at"], reverse=True)
+            status_upper = status.upper()
+            jobs = (job for job in jobs if job["status"].upper() == status_upper)
         
-        # 限制結果數量
-        all_jobs = all_jobs[:limit]
+        # 只保留最新的 limit 筆（按創建時間，最新的在前），無需完整排序
+        all_jobs = heapq.nlargest(limit, jobs, key=lambda x: x["created_at"])
         
         return [
             ETLJobResponse(
@@ -479,7 +496,8 @@ async def validate_data(
             total_records=report.total_records,
             valid_records=report.valid_records,
             invalid_records=report.invalid_records,
-            issues=[issue.to_dict() for issue in report.issues],
+            # 未要求詳細信息時跳過逐條問題的序列化
+            issues=[issue.to_dict() for issue in report.issues] if request.include_details else [],
             recommendations=report.recommendations,
             created_at=datetime.now()
         )
@@ -16,10 +16,12 @@
 
 import asyncio
 import json
+import operator
 import time
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Any, Optional
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 
 import aiohttp
@@ -37,7 +39,7 @@ from ..proxy_manager.models import ProxyNode, ProxyStatus
 from database_config import db_config
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemMetrics:
     """系統指標"""
     timestamp: datetime
@@ -56,6 +58,21 @@ class SystemMetrics:
         return data
 
 
+def _never(value: Any, threshold: Any) -> bool:
+    """未知運算子永不觸發"""
+    return False
+
+
+_RULE_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
 @dataclass
 class AlertRule:
     """警報規則"""
@@ -65,25 +82,21 @@ class AlertRule:
     threshold: float
     severity: str  # 'info', 'warning', 'error', 'critical'
     enabled: bool = True
+    _compare: Callable[[Any, Any], bool] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # 規則創建時解析一次比較運算子，check 時直接調用
+        self._compare = _RULE_OPERATORS.get(self.operator, _never)
     
     def check(self, value: float) -> bool:
         """檢查是否觸發警報"""
         if not self.enabled:
             return False
         
-        operators = {
-            '>': lambda x, y: x > y,
-            '<': lambda x, y: x < y,
-            '>=': lambda x, y: x >= y,
-            '<=': lambda x, y: x <= y,
-            '==': lambda x, y: x == y,
-            '!=': lambda x, y: x != y
-        }
-        
-        return operators.get(self.operator, lambda x, y: False)(value, self.threshold)
+        return self._compare(value, self.threshold)
 
 
-@dataclass
+@dataclass(slots=True)
 class Alert:
     """警報"""
     id: str
@@ -99,6 +112,233 @@ class Alert:
         return data
 
 
+# 簡單的儀表板 HTML 頁面：內容固定，模組載入時編碼一次，各請求共用
+_DASHBOARD_HTML = """
+<!DOCTYPE html>
+<html lang="zh-TW">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>代理監控儀表板</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            margin: 0;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+        }
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px;
+            border-radius: 10px;
+            margin-bottom: 20px;
+            text-align: center;
+        }
+        .metrics-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 20px;
+            margin-bottom: 20px;
+        }
+        .metric-card {
+            background: white;
+            padding: 20px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            text-align: center;
+        }
+        .metric-value {
+            font-size: 2em;
+            font-weight: bold;
+            color: #333;
+        }
+        .metric-label {
+            color: #666;
+            margin-top: 5px;
+        }
+        .alerts-section {
+            background: white;
+            padding: 20px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            margin-bottom: 20px;
+        }
+        .alert {
+            padding: 10px;
+            margin: 10px 0;
+            border-radius: 5px;
+            border-left: 4px solid;
+        }
+        .alert.warning {
+            background-color: #fff3cd;
+            border-color: #ffc107;
+        }
+        .alert.error {
+            background-color: #f8d7da;
+            border-color: #dc3545;
+        }
+        .alert.critical {
+            background-color: #f5c6cb;
+            border-color: #721c24;
+        }
+        .status-indicator {
+            display: inline-block;
+            width: 12px;
+            height: 12px;
+            border-radius: 50%;
+            margin-right: 8px;
+        }
+        .status-online {
+            background-color: #28a745;
+        }
+        .status-offline {
+            background-color: #dc3545;
+        }
+        .chart-container {
+            background: white;
+            padding: 20px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            height: 300px;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>代理監控儀表板</h1>
+            <p>實時監控代理系統狀態和性能</p>
+        </div>
+        
+        <div class="metrics-grid">
+            <div class="metric-card">
+                <div class="metric-value" id="total-proxies">-</div>
+                <div class="metric-label">總代理數</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value" id="active-proxies">-</div>
+                <div class="metric-label">活躍代理</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value" id="validation-rate">-</div>
+                <div class="metric-label">驗證成功率</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value" id="avg-response-time">-</div>
+                <div class="metric-label">平均響應時間 (ms)</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">
+                    <span class="status-indicator" id="etl-status-indicator"></span>
+                    <span id="etl-status">-</span>
+                </div>
+                <div class="metric-label">ETL 管道狀態</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value" id="memory-usage">-</div>
+                <div class="metric-label">記憶體使用 (MB)</div>
+            </div>
+        </div>
+        
+        <div class="alerts-section">
+            <h3>系統警報</h3>
+            <div id="alerts-container">
+                <p>暫無警報</p>
+            </div>
+        </div>
+        
+        <div class="chart-container">
+            <h3>性能趨勢圖</h3>
+            <p>圖表功能需要整合 Chart.js 或其他圖表庫</p>
+        </div>
+    </div>
+    
+    <script>
+        // WebSocket 連接
+        const ws = new WebSocket(`ws://${window.location.host}/ws`);
+        
+        ws.onopen = function(event) {
+            console.log('WebSocket 連接已建立');
+        };
+        
+        ws.onmessage = function(event) {
+            const message = JSON.parse(event.data);
+            
+            if (message.type === 'metrics_update') {
+                updateMetrics(message.data);
+            } else if (message.type === 'new_alert') {
+                addAlert(message.data);
+            }
+        };
+        
+        ws.onclose = function(event) {
+            console.log('WebSocket 連接已關閉');
+            // 嘗試重新連接
+            setTimeout(() => {
+                location.reload();
+            }, 5000);
+        };
+        
+        function updateMetrics(metrics) {
+            document.getElementById('total-proxies').textContent = metrics.total_proxies;
+            document.getElementById('active-proxies').textContent = metrics.active_proxies;
+            document.getElementById('validation-rate').textContent = (metrics.validation_success_rate * 100).toFixed(1) + '%';
+            document.getElementById('avg-response-time').textContent = Math.round(metrics.avg_response_time);
+            document.getElementById('etl-status').textContent = metrics.etl_pipeline_status;
+            document.getElementById('memory-usage').textContent = Math.round(metrics.memory_usage_mb);
+            
+            // 更新狀態指示器
+            const statusIndicator = document.getElementById('etl-status-indicator');
+            if (metrics.etl_pipeline_status === 'running') {
+                statusIndicator.className = 'status-indicator status-online';
+            } else {
+                statusIndicator.className = 'status-indicator status-offline';
+            }
+        }
+        
+        function addAlert(alert) {
+            const alertsContainer = document.getElementById('alerts-container');
+            
+            // 移除 "暫無警報" 消息
+            if (alertsContainer.children.length === 1 && alertsContainer.children[0].tagName === 'P') {
+                alertsContainer.innerHTML = '';
+            }
+            
+            const alertElement = document.createElement('div');
+            alertElement.className = `alert ${alert.severity}`;
+            alertElement.innerHTML = `
+                <strong>${alert.rule_name}</strong><br>
+                ${alert.message}<br>
+                <small>${new Date(alert.timestamp).toLocaleString('zh-TW')}</small>
+            `;
+            
+            alertsContainer.insertBefore(alertElement, alertsContainer.firstChild);
+        }
+        
+        // 初始載入數據
+        fetch('/api/metrics')
+            .then(response => response.json())
+            .then(data => updateMetrics(data))
+            .catch(error => console.error('載入指標失敗:', error));
+        
+        // 載入現有警報
+        fetch('/api/alerts')
+            .then(response => response.json())
+            .then(alerts => {
+                alerts.forEach(alert => addAlert(alert));
+            })
+            .catch(error => console.error('載入警報失敗:', error));
+    </script>
+</body>
+</html>
+""".encode('utf-8')
+
+
 class MonitoringDashboard:
     """監控儀表板
     
@@ -346,25 +586,22 @@ class MonitoringDashboard:
     
     async def _check_alerts(self, metrics: SystemMetrics) -> None:
         """檢查警報條件"""
-        metrics_dict = metrics.to_dict()
+        # 一次掃描收集已有未確認警報的規則，避免每條規則重複遍歷警報列表
+        open_rule_names = {alert.rule_name for alert in self.alerts if not alert.acknowledged}
         
         for rule in self.alert_rules:
             if not rule.enabled:
                 continue
             
-            metric_value = metrics_dict.get(rule.metric)
+            metric_value = getattr(metrics, rule.metric, None)
             if metric_value is None:
                 continue
             
             if rule.check(metric_value):
                 # 檢查是否已經有相同的未確認警報
-                existing_alert = next(
-                    (alert for alert in self.alerts 
-                     if alert.rule_name == rule.name and not alert.acknowledged),
-                    None
-                )
-                
-                if not existing_alert:
+                if rule.name not in open_rule_names:
+                    open_rule_names.add(rule.name)
+                    
                     # 創建新警報
                     alert = Alert(
                         id=f"{rule.name}_{int(time.time())}",
@@ -391,17 +628,24 @@ class MonitoringDashboard:
         
         message_str = json.dumps(message, ensure_ascii=False)
         
-        # 移除已關閉的連接
-        active_connections = []
-        for ws in self.websocket_connections:
-            if not ws.closed:
-                try:
-                    await ws.send_str(message_str)
-                    active_connections.append(ws)
-                except Exception as e:
-                    self.logger.warning(f"發送 WebSocket 消息失敗: {e}")
+        # 並發發送到所有開啟中的連接，單一客戶端變慢不會拖累其他客戶端
+        open_connections = [ws for ws in self.websocket_connections if not ws.closed]
+        results = await asyncio.gather(
+            *(ws.send_str(message_str) for ws in open_connections),
+            return_exceptions=True
+        )
+        
+        failed = set()
+        for ws, result in zip(open_connections, results):
+            if isinstance(result, BaseException):
+                failed.add(ws)
+                self.logger.warning(f"發送 WebSocket 消息失敗: {result}")
         
-        self.websocket_connections = active_connections
+        # 移除已關閉或發送失敗的連接（保留發送期間新加入的連接）
+        self.websocket_connections = [
+            ws for ws in self.websocket_connections
+            if not ws.closed and ws not in failed
+        ]
     
     # Web 處理器
     async def index_handler(self, request: Request) -> Response:
@@ -413,235 +657,10 @@ class MonitoringDashboard:
     
     async def dashboard_handler(self, request: Request) -> Response:
         """儀表板頁面處理器"""
-        # 簡單的 HTML 頁面
-        html_content = """
-<!DOCTYPE html>
-<html lang="zh-TW">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>代理監控儀表板</title>
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-        }
-        .header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            text-align: center;
-        }
-        .metrics-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 20px;
-        }
-        .metric-card {
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            text-align: center;
-        }
-        .metric-value {
-            font-size: 2em;
-            font-weight: bold;
-            color: #333;
-        }
-        .metric-label {
-            color: #666;
-            margin-top: 5px;
-        }
-        .alerts-section {
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            margin-bottom: 20px;
-        }
-        .alert {
-            padding: 10px;
-            margin: 10px 0;
-            border-radius: 5px;
-            border-left: 4px solid;
-        }
-        .alert.warning {
-            background-color: #fff3cd;
-            border-color: #ffc107;
-        }
-        .alert.error {
-            background-color: #f8d7da;
-            border-color: #dc3545;
-        }
-        .alert.critical {
-            background-color: #f5c6cb;
-            border-color: #721c24;
-        }
-        .status-indicator {
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            margin-right: 8px;
-        }
-        .status-online {
-            background-color: #28a745;
-        }
-        .status-offline {
-            background-color: #dc3545;
-        }
-        .chart-container {
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            height: 300px;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>代理監控儀表板</h1>
-            <p>實時監控代理系統狀態和性能</p>
-        </div>
-        
-        <div class="metrics-grid">
-            <div class="metric-card">
-                <div class="metric-value" id="total-proxies">-</div>
-                <div class="metric-label">總代理數</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value" id="active-proxies">-</div>
-                <div class="metric-label">活躍代理</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value" id="validation-rate">-</div>
-                <div class="metric-label">驗證成功率</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value" id="avg-response-time">-</div>
-                <div class="metric-label">平均響應時間 (ms)</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">
-                    <span class="status-indicator" id="etl-status-indicator"></span>
-                    <span id="etl-status">-</span>
-                </div>
-                <div class="metric-label">ETL 管道狀態</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value" id="memory-usage">-</div>
-                <div class="metric-label">記憶體使用 (MB)</div>
-            </div>
-        </div>
-        
-        <div class="alerts-section">
-            <h3>系統警報</h3>
-            <div id="alerts-container">
-                <p>暫無警報</p>
-            </div>
-        </div>
-        
-        <div class="chart-container">
-            <h3>性能趨勢圖</h3>
-            <p>圖表功能需要整合 Chart.js 或其他圖表庫</p>
-        </div>
-    </div>
-    
-    <script>
-        // WebSocket 連接
-        const ws = new WebSocket(`ws://${window.location.host}/ws`);
-        
-        ws.onopen = function(event) {
-            console.log('WebSocket 連接已建立');
-        };
-        
-        ws.onmessage = function(event) {
-            const message = JSON.parse(event.data);
-            
-            if (message.type === 'metrics_update') {
-                updateMetrics(message.data);
-            } else if (message.type === 'new_alert') {
-                addAlert(message.data);
-            }
-        };
-        
-        ws.onclose = function(event) {
-            console.log('WebSocket 連接已關閉');
-            // 嘗試重新連接
-            setTimeout(() => {
-                location.reload();
-            }, 5000);
-        };
-        
-        function updateMetrics(metrics) {
-            document.getElementById('total-proxies').textContent = metrics.total_proxies;
-            document.getElementById('active-proxies').textContent = metrics.active_proxies;
-            document.getElementById('validation-rate').textContent = (metrics.validation_success_rate * 100).toFixed(1) + '%';
-            document.getElementById('avg-response-time').textContent = Math.round(metrics.avg_response_time);
-            document.getElementById('etl-status').textContent = metrics.etl_pipeline_status;
-            document.getElementById('memory-usage').textContent = Math.round(metrics.memory_usage_mb);
-            
-            // 更新狀態指示器
-            const statusIndicator = document.getElementById('etl-status-indicator');
-            if (metrics.etl_pipeline_status === 'running') {
-                statusIndicator.className = 'status-indicator status-online';
-            } else {
-                statusIndicator.className = 'status-indicator status-offline';
-            }
-        }
-        
-        function addAlert(alert) {
-            const alertsContainer = document.getElementById('alerts-container');
-            
-            // 移除 "暫無警報" 消息
-            if (alertsContainer.children.length === 1 && alertsContainer.children[0].tagName === 'P') {
-                alertsContainer.innerHTML = '';
-            }
-            
-            const alertElement = document.createElement('div');
-            alertElement.className = `alert ${alert.severity}`;
-            alertElement.innerHTML = `
-                <strong>${alert.rule_name}</strong><br>
-                ${alert.message}<br>
-                <small>${new Date(alert.timestamp).toLocaleString('zh-TW')}</small>
-            `;
-            
-            alertsContainer.insertBefore(alertElement, alertsContainer.firstChild);
-        }
-        
-        // 初始載入數據
-        fetch('/api/metrics')
-            .then(response => response.json())
-            .then(data => updateMetrics(data))
-            .catch(error => console.error('載入指標失敗:', error));
-        
-        // 載入現有警報
-        fetch('/api/alerts')
-            .then(response => response.json())
-            .then(alerts => {
-                alerts.forEach(alert => addAlert(alert));
-            })
-            .catch(error => console.error('載入警報失敗:', error));
-    </script>
-</body>
-</html>
-        """
-        
         return web.Response(
-            text=html_content,
-            content_type='text/html; charset=utf-8'
+            body=_DASHBOARD_HTML,
+            content_type='text/html',
+            charset='utf-8'
         )
     
     # API 處理器
@@ -700,11 +719,23 @@ class MonitoringDashboard:
         """獲取警報列表"""
         # 獲取查詢參數
         acknowledged = request.query.get('acknowledged')
+        limit = request.query.get('limit')
+        if limit is not None:
+            try:
+                limit = max(int(limit), 0)
+            except ValueError:
+                return web.json_response({'error': 'limit 必須為整數'}, status=400)
         
         alerts = self.alerts
+        if limit is not None:
+            # 只取最新的 limit 筆：從尾端惰性過濾，取夠即停，不物化完整列表
+            alerts = reversed(alerts)
         if acknowledged is not None:
             acknowledged_bool = acknowledged.lower() == 'true'
-            alerts = [alert for alert in alerts if alert.acknowledged == acknowledged_bool]
+            alerts = (alert for alert in alerts if alert.acknowledged == acknowledged_bool)
+        if limit is not None:
+            alerts = list(islice(alerts, limit))
+            alerts.reverse()
         
         return web.json_response([alert.to_dict() for alert in alerts])
     
@@ -828,9 +859,8 @@ if __name__ == "__main__":
             await dashboard.start()
             print(f"監控儀表板已啟動: http://{dashboard.host}:{dashboard.port}/dashboard")
             
-            # 保持運行
-            while True:
-                await asyncio.sleep(1)
+            # 保持運行：阻塞等待直到被中斷，不再每秒喚醒輪詢
+            await asyncio.Event().wait()
         
         except KeyboardInterrupt:
             print("正在停止儀表板...")
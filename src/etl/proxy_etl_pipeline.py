@@ -141,6 +141,38 @@ class ETLResult:
         return result
 
 
+# 依 unique_proxy (host, port, protocol) 約束批量 upsert 代理；created_at 僅在首次插入時寫入
+_UPSERT_PROXY_SQL = """
+    INSERT INTO proxy_nodes (
+        host, port, protocol, anonymity,
+        country, region, city, latitude, longitude,
+        isp, organization, source, source_url,
+        response_time_ms, score, last_checked,
+        metadata, created_at, updated_at
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9,
+        $10, $11, $12, $13, $14, $15, $16,
+        $17, NOW(), NOW()
+    )
+    ON CONFLICT ON CONSTRAINT unique_proxy DO UPDATE SET
+        anonymity = EXCLUDED.anonymity,
+        country = EXCLUDED.country,
+        region = EXCLUDED.region,
+        city = EXCLUDED.city,
+        latitude = EXCLUDED.latitude,
+        longitude = EXCLUDED.longitude,
+        isp = EXCLUDED.isp,
+        organization = EXCLUDED.organization,
+        source = EXCLUDED.source,
+        source_url = EXCLUDED.source_url,
+        response_time_ms = EXCLUDED.response_time_ms,
+        score = EXCLUDED.score,
+        last_checked = EXCLUDED.last_checked,
+        updated_at = NOW(),
+        metadata = EXCLUDED.metadata
+"""
+
+
 class ProxyETLPipeline:
     """代理 ETL 數據管道
     
@@ -178,23 +210,15 @@ class ProxyETLPipeline:
     async def initialize(self) -> None:
         """初始化連接"""
         try:
-            # 初始化數據庫連接池
-            if self.config.enable_database_storage:
-                database_url = self.db_config.get_database_url('async')
-                self.db_pool = await asyncpg.create_pool(
-                    database_url,
-                    min_size=5,
-                    max_size=20,
-                    command_timeout=30
-                )
-                self.logger.info("數據庫連接池初始化完成")
-            
-            # 初始化 Redis 連接
-            if self.config.enable_redis_cache:
-                redis_url = self.db_config.get_redis_url()
-                self.redis_client = redis.from_url(redis_url)
-                await self.redis_client.ping()
-                self.logger.info("Redis 連接初始化完成")
+            # 數據庫連接池與 Redis 連接互不依賴，並發建立；兩者都結束後再回報第一個錯誤
+            results = await asyncio.gather(
+                self._init_database(),
+                self._init_redis(),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
             
             # 初始化 HTTP 會話
             timeout = aiohttp.ClientTimeout(total=self.config.validation_timeout)
@@ -206,6 +230,26 @@ class ProxyETLPipeline:
             await self.cleanup()
             raise
     
+    async def _init_database(self) -> None:
+        """初始化數據庫連接池"""
+        if self.config.enable_database_storage:
+            database_url = self.db_config.get_database_url('async')
+            self.db_pool = await asyncpg.create_pool(
+                database_url,
+                min_size=5,
+                max_size=20,
+                command_timeout=30
+            )
+            self.logger.info("數據庫連接池初始化完成")
+    
+    async def _init_redis(self) -> None:
+        """初始化 Redis 連接"""
+        if self.config.enable_redis_cache:
+            redis_url = self.db_config.get_redis_url()
+            self.redis_client = redis.from_url(redis_url)
+            await self.redis_client.ping()
+            self.logger.info("Redis 連接初始化完成")
+    
     async def cleanup(self) -> None:
         """清理資源"""
         if self.http_session:
@@ -586,145 +630,81 @@ class ProxyETLPipeline:
             self.logger.info("沒有代理數據需要載入")
             return 0
         
-        loaded_count = 0
+        # 先在本地組裝所有參數行，組裝失敗的代理單獨計數
+        rows = []
         failed_count = 0
+        for proxy in proxies:
+            try:
+                rows.append(self._proxy_to_db_row(proxy))
+            except Exception as e:
+                failed_count += 1
+                self.logger.error(f"載入代理失敗 {proxy.host}:{proxy.port}: {e}")
         
         try:
             async with self.db_pool.acquire() as conn:
-                # 開始事務
+                # 單一事務內以 executemany 批量 upsert，取代逐筆查詢後再插入/更新的兩次往返
                 async with conn.transaction():
-                    for proxy in proxies:
-                        try:
-                            # 檢查代理是否已存在
-                            existing_proxy = await conn.fetchrow(
-                                """
-                                SELECT id FROM proxy_nodes 
-                                WHERE host = $1 AND port = $2 AND protocol = $3
-                                """,
-                                proxy.host, proxy.port, proxy.protocol.value
-                            )
-                            
-                            if existing_proxy:
-                                # 更新現有代理
-                                await conn.execute(
-                                    """
-                                    UPDATE proxy_nodes SET
-                                        anonymity = $1,
-                                        country = $2,
-                                        region = $3,
-                                        city = $4,
-                                        latitude = $5,
-                                        longitude = $6,
-                                        isp = $7,
-                                        organization = $8,
-                                        source = $9,
-                                        source_url = $10,
-                                        response_time_ms = $11,
-                                        score = $12,
-                                        last_checked = $13,
-                                        updated_at = NOW(),
-                                        metadata = $14
-                                    WHERE host = $15 AND port = $16 AND protocol = $17
-                                    """,
-                                    proxy.anonymity.value,
-                                    proxy.country,
-                                    proxy.region,
-                                    proxy.city,
-                                    proxy.latitude,
-                                    proxy.longitude,
-                                    proxy.isp,
-                                    proxy.organization,
-                                    proxy.source,
-                                    proxy.source_url,
-                                    proxy.metrics.avg_response_time if proxy.metrics else None,
-                                    proxy.score,
-                                    proxy.last_checked,
-                                    json.dumps(proxy.metadata) if proxy.metadata else '{}',
-                                    proxy.host,
-                                    proxy.port,
-                                    proxy.protocol.value
-                                )
-                                self.logger.debug(f"更新代理: {proxy.host}:{proxy.port}")
-                            else:
-                                # 插入新代理
-                                await conn.execute(
-                                    """
-                                    INSERT INTO proxy_nodes (
-                                        host, port, protocol, anonymity,
-                                        country, region, city, latitude, longitude,
-                                        isp, organization, source, source_url,
-                                        response_time_ms, score, last_checked,
-                                        metadata, created_at, updated_at
-                                    ) VALUES (
-                                        $1, $2, $3, $4, $5, $6, $7, $8, $9,
-                                        $10, $11, $12, $13, $14, $15, $16,
-                                        $17, NOW(), NOW()
-                                    )
-                                    """,
-                                    proxy.host,
-                                    proxy.port,
-                                    proxy.protocol.value,
-                                    proxy.anonymity.value,
-                                    proxy.country,
-                                    proxy.region,
-                                    proxy.city,
-                                    proxy.latitude,
-                                    proxy.longitude,
-                                    proxy.isp,
-                                    proxy.organization,
-                                    proxy.source,
-                                    proxy.source_url,
-                                    proxy.metrics.avg_response_time if proxy.metrics else None,
-                                    proxy.score,
-                                    proxy.last_checked,
-                                    json.dumps(proxy.metadata) if proxy.metadata else '{}'
-                                )
-                                self.logger.debug(f"插入新代理: {proxy.host}:{proxy.port}")
-                            
-                            loaded_count += 1
-                            
-                        except Exception as e:
-                            failed_count += 1
-                            self.logger.error(f"載入代理失敗 {proxy.host}:{proxy.port}: {e}")
-                            continue
-                    
-                    self.logger.info(
-                        f"數據庫載入完成: 成功 {loaded_count} 條，失敗 {failed_count} 條"
-                    )
-                    
+                    await conn.executemany(_UPSERT_PROXY_SQL, rows)
+            
+            loaded_count = len(rows)
+            self.logger.info(
+                f"數據庫載入完成: 成功 {loaded_count} 條，失敗 {failed_count} 條"
+            )
+            
         except Exception as e:
             self.logger.error(f"數據庫載入過程中發生錯誤: {e}")
             raise
         
         return loaded_count
     
+    @staticmethod
+    def _proxy_to_db_row(proxy: ProxyNode) -> Tuple[Any, ...]:
+        """將代理轉換為 upsert 語句的參數行（順序對應 _UPSERT_PROXY_SQL）"""
+        return (
+            proxy.host,
+            proxy.port,
+            proxy.protocol.value,
+            proxy.anonymity.value,
+            proxy.country,
+            proxy.region,
+            proxy.city,
+            getattr(proxy, 'latitude', None),
+            getattr(proxy, 'longitude', None),
+            proxy.isp,
+            getattr(proxy, 'organization', None),
+            proxy.source,
+            getattr(proxy, 'source_url', None),
+            proxy.metrics.avg_response_time if proxy.metrics else None,
+            proxy.score,
+            proxy.last_checked,
+            json.dumps(proxy.metadata) if proxy.metadata else '{}'
+        )
+    
     async def _load_to_cache(self, proxies: List[ProxyNode]) -> int:
         """載入到 Redis 快取"""
         if not self.redis_client:
             return 0
         
         cached_count = 0
+        ttl = int(timedelta(hours=24).total_seconds())
         
+        # 所有寫入排入同一個管線，一次往返送出，而非每個代理兩次往返
+        pipe = self.redis_client.pipeline(transaction=False)
         for proxy in proxies:
             if proxy.is_available:
                 # 快取可用代理
                 key = f"proxy:{proxy.host}:{proxy.port}"
                 value = json.dumps(proxy.to_dict(), default=str)
                 
-                await self.redis_client.setex(
-                    key, 
-                    timedelta(hours=24).total_seconds(), 
-                    value
-                )
-                
+                pipe.setex(key, ttl, value)
                 # 添加到可用代理集合
-                await self.redis_client.zadd(
-                    "available_proxies",
-                    {key: proxy.score}
-                )
+                pipe.zadd("available_proxies", {key: proxy.score})
                 
                 cached_count += 1
         
+        if cached_count:
+            await pipe.execute()
+        
         return cached_count
     
     async def _generate_reports(self, proxies: List[ProxyNode]) -> None:
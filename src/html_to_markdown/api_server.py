@@ -365,7 +365,8 @@ def main():
         rotation="1 day",
         retention="7 days",
         level="INFO",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} - {message}"
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} - {message}",
+        enqueue=True
     )
     
     # 啟動服務器
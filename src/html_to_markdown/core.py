@@ -8,6 +8,7 @@ from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List
 from enum import Enum
 import asyncio
+import hashlib
 from datetime import datetime
 from loguru import logger
 
@@ -353,31 +354,32 @@ class HTMLToMarkdownConverter(ABC):
             return "Untitled"
     
     def _get_cache_key(self, html_content: str, url: str) -> str:
-        """生成快取鍵值"""
-        import hashlib
+        """生成快取鍵值（內容 + 配置的內容雜湊）"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(html_content.encode())
+        digest.update(b"\0")
+        digest.update(repr(self.config).encode())
         
-        content_hash = hashlib.md5(html_content.encode()).hexdigest()
-        config_hash = hashlib.md5(str(self.config).encode()).hexdigest()
-        
-        return f"{url}:{content_hash}:{config_hash}"
+        return f"{url}:{digest.hexdigest()}"
     
     async def get_cached_result(self, html_content: str, url: str) -> Optional[ConversionResult]:
         """獲取快取結果"""
         if not self.config.enable_caching:
             return None
         
-        cache_key = self._get_cache_key(html_content, url)
-        return self._cache.get(cache_key)
+        return self._cache.get(self._get_cache_key(html_content, url))
     
     async def cache_result(self, html_content: str, url: str, result: ConversionResult):
         """快取結果"""
         if not self.config.enable_caching:
             return
         
-        cache_key = self._get_cache_key(html_content, url)
+        self._store_cached(self._get_cache_key(html_content, url), result)
+    
+    def _store_cached(self, cache_key: str, result: ConversionResult):
+        """寫入快取並限制快取大小"""
         self._cache[cache_key] = result
         
-        # 限制快取大小
         if len(self._cache) > 1000:
             # 移除最舊的條目
             oldest_key = next(iter(self._cache))
@@ -393,11 +395,13 @@ class HTMLToMarkdownConverter(ABC):
         Returns:
             ConversionResult: 轉換結果
         """
-        # 檢查快取
-        cached_result = await self.get_cached_result(html_content, url)
-        if cached_result:
-            self.logger.debug(f"使用快取結果: {url}")
-            return cached_result
+        # 檢查快取（鍵值只計算一次，命中與寫入共用）
+        cache_key = self._get_cache_key(html_content, url) if self.config.enable_caching else None
+        if cache_key is not None:
+            cached_result = self._cache.get(cache_key)
+            if cached_result:
+                self.logger.debug(f"使用快取結果: {url}")
+                return cached_result
         
         last_error = None
         
@@ -409,7 +413,8 @@ class HTMLToMarkdownConverter(ABC):
                 )
                 
                 # 快取成功結果
-                await self.cache_result(html_content, url, result)
+                if cache_key is not None:
+                    self._store_cached(cache_key, result)
                 
                 return result
                 
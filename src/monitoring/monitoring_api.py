@@ -9,6 +9,8 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
 from typing import Dict, List, Optional, Any
+from contextlib import asynccontextmanager
+from dataclasses import replace
 from datetime import datetime, timedelta
 import asyncio
 import logging
@@ -17,16 +19,33 @@ from .system_monitor import SystemMonitor, MonitoringConfig, AlertLevel
 
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """應用程式生命週期：關閉時停止監控並等待監控任務結束"""
+    yield
+    await monitor.shutdown()
+
+
 # 創建監控 API 應用程式
 monitoring_api = FastAPI(
     title="System Monitoring API",
     description="系統監控和告警管理 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=_lifespan,
 )
 
 # 初始化系統監控器
 monitor = SystemMonitor()
 
+# 允許透過 /config/update 修改的監控配置欄位
+_UPDATABLE_CONFIG_FIELDS = frozenset({
+    "cpu_threshold",
+    "memory_threshold",
+    "disk_threshold",
+    "error_rate_threshold",
+    "check_interval",
+})
+
 
 @monitoring_api.get("/health")
 async def health_check() -> Dict[str, Any]:
@@ -113,6 +132,43 @@ async def get_metrics_history(hours: int = 24) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"獲取歷史數據失敗: {str(e)}")
 
 
+@monitoring_api.get("/metrics/rollups")
+async def get_metrics_rollups(hours: int = 24) -> Dict[str, Any]:
+    """獲取指標小時匯總
+    
+    Args:
+        hours: 小時桶數量
+    """
+    try:
+        rollups = monitor.get_metrics_rollups(hours)
+        
+        rollup_data = []
+        for rollup in rollups:
+            rollup_data.append({
+                "bucket_start": rollup.bucket_start.isoformat(),
+                "granularity": "1h",
+                "count": rollup.count,
+                "cpu_avg": round(rollup.cpu_sum / rollup.count, 2),
+                "cpu_max": rollup.cpu_max,
+                "memory_avg": round(rollup.memory_sum / rollup.count, 2),
+                "memory_max": rollup.memory_max,
+                "disk_avg": round(rollup.disk_sum / rollup.count, 2),
+                "disk_max": rollup.disk_max,
+                "error_rate_avg": rollup.error_rate_sum / rollup.count
+            })
+        
+        return {
+            "success": True,
+            "rollups": rollup_data,
+            "period_hours": hours,
+            "total_records": len(rollup_data)
+        }
+        
+    except Exception as e:
+        logger.error(f"❌ 獲取指標匯總失敗: {e}")
+        raise HTTPException(status_code=500, detail=f"獲取匯總數據失敗: {str(e)}")
+
+
 @monitoring_api.get("/alerts/active")
 async def get_active_alerts() -> Dict[str, Any]:
     """獲取活躍告警"""
@@ -219,8 +275,8 @@ async def get_monitoring_dashboard() -> Dict[str, Any]:
         # 獲取當前指標
         current_metrics = monitor.get_current_metrics()
         
-        # 獲取歷史數據 (最近 24 小時)
-        history = monitor.get_metrics_history(24)
+        # 最近 24 小時平均值（基於小時匯總，不掃描原始採樣）
+        averages = monitor.get_metrics_averages(24)
         
         # 獲取活躍告警
         active_alerts = monitor.get_active_alerts()
@@ -228,14 +284,6 @@ async def get_monitoring_dashboard() -> Dict[str, Any]:
         # 獲取系統健康狀態
         health = monitor.get_system_health()
         
-        # 計算統計數據
-        if history:
-            cpu_avg = sum(m.cpu_percent for m in history) / len(history)
-            memory_avg = sum(m.memory_percent for m in history) / len(history)
-            disk_avg = sum(m.disk_percent for m in history) / len(history)
-        else:
-            cpu_avg = memory_avg = disk_avg = 0
-        
         # 準備儀表板數據
         dashboard_data = {
             "current_metrics": {
@@ -246,9 +294,9 @@ async def get_monitoring_dashboard() -> Dict[str, Any]:
                 "active_connections": current_metrics.active_connections if current_metrics else 0
             },
             "averages_24h": {
-                "cpu_percent": round(cpu_avg, 2),
-                "memory_percent": round(memory_avg, 2),
-                "disk_percent": round(disk_avg, 2)
+                "cpu_percent": round(averages["cpu_percent"], 2),
+                "memory_percent": round(averages["memory_percent"], 2),
+                "disk_percent": round(averages["disk_percent"], 2)
             },
             "alerts": {
                 "active_count": len(active_alerts),
@@ -279,17 +327,11 @@ async def update_monitoring_config(
         config_data: 配置數據
     """
     try:
-        # 更新配置
-        if "cpu_threshold" in config_data:
-            monitor.config.cpu_threshold = config_data["cpu_threshold"]
-        if "memory_threshold" in config_data:
-            monitor.config.memory_threshold = config_data["memory_threshold"]
-        if "disk_threshold" in config_data:
-            monitor.config.disk_threshold = config_data["disk_threshold"]
-        if "error_rate_threshold" in config_data:
-            monitor.config.error_rate_threshold = config_data["error_rate_threshold"]
-        if "check_interval" in config_data:
-            monitor.config.check_interval = config_data["check_interval"]
+        # 更新配置：僅接受白名單欄位，以 dataclasses.replace 產生新配置一次性替換
+        monitor.config = replace(
+            monitor.config,
+            **{key: value for key, value in config_data.items() if key in _UPDATABLE_CONFIG_FIELDS}
+        )
         
         return {
             "success": True,
@@ -7,11 +7,13 @@
 """
 
 import asyncio
+from bisect import bisect_left
+from operator import attrgetter
 import psutil
 import time
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import logging
@@ -19,6 +21,8 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+_timestamp_of = attrgetter("timestamp")
+
 
 class AlertLevel(Enum):
     """告警級別"""
@@ -28,7 +32,7 @@ class AlertLevel(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemMetrics:
     """系統指標"""
     timestamp: datetime
@@ -47,7 +51,32 @@ class SystemMetrics:
     error_rate: float
 
 
-@dataclass
+@dataclass(slots=True)
+class MetricsRollup:
+    """指標小時匯總（隨採樣增量更新，查詢時無需掃描原始數據）"""
+    bucket_start: datetime
+    count: int = 0
+    cpu_sum: float = 0.0
+    cpu_max: float = 0.0
+    memory_sum: float = 0.0
+    memory_max: float = 0.0
+    disk_sum: float = 0.0
+    disk_max: float = 0.0
+    error_rate_sum: float = 0.0
+    
+    def add(self, metrics: SystemMetrics):
+        """累加一筆採樣"""
+        self.count += 1
+        self.cpu_sum += metrics.cpu_percent
+        self.cpu_max = max(self.cpu_max, metrics.cpu_percent)
+        self.memory_sum += metrics.memory_percent
+        self.memory_max = max(self.memory_max, metrics.memory_percent)
+        self.disk_sum += metrics.disk_percent
+        self.disk_max = max(self.disk_max, metrics.disk_percent)
+        self.error_rate_sum += metrics.error_rate
+
+
+@dataclass(slots=True)
 class Alert:
     """告警"""
     id: str
@@ -69,6 +98,8 @@ class MonitoringConfig:
     check_interval: int = 30  # 秒
     alert_cooldown: int = 300  # 秒
     data_retention_days: int = 7
+    metrics_flush_size: int = 10  # 緩衝多少筆指標後寫入文件
+    metrics_flush_interval: int = 300  # 秒，緩衝最長保留時間
 
 
 class SystemMonitor:
@@ -81,9 +112,20 @@ class SystemMonitor:
         
         # 監控狀態
         self.is_running = False
+        self._monitor_task: Optional[asyncio.Task] = None
         self.metrics_history: List[SystemMetrics] = []
+        self.hourly_rollups: Dict[datetime, MetricsRollup] = {}
         self.active_alerts: List[Alert] = []
+        # 未解決告警索引（id -> Alert，插入順序即時間順序），狀態變更時同步維護
+        self._open_alerts: Dict[str, Alert] = {}
+        # 回調在註冊時即依同步/異步分類，避免每次告警都做反射判斷
         self.alert_callbacks: List[Callable[[Alert], None]] = []
+        self._async_alert_callbacks: List[Callable[[Alert], Awaitable[None]]] = []
+        
+        # 待寫入文件的指標緩衝
+        self._pending_metrics: List[SystemMetrics] = []
+        self._pending_since: Optional[float] = None
+        self._purged_day: Optional[date] = None
         
         # 網絡統計基準
         self._network_baseline = None
@@ -96,7 +138,7 @@ class SystemMonitor:
         """啟動監控"""
         if not self.is_running:
             self.is_running = True
-            asyncio.create_task(self._monitoring_loop())
+            self._monitor_task = asyncio.create_task(self._monitoring_loop())
             logger.info("🚀 系統監控已啟動")
     
     async def _monitoring_loop(self):
@@ -106,6 +148,7 @@ class SystemMonitor:
                 # 收集系統指標
                 metrics = await self._collect_metrics()
                 self.metrics_history.append(metrics)
+                self._update_rollup(metrics)
                 
                 # 檢查告警條件
                 await self._check_alerts(metrics)
@@ -125,8 +168,14 @@ class SystemMonitor:
     
     async def _collect_metrics(self) -> SystemMetrics:
         """收集系統指標"""
-        # CPU 使用率
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # CPU 採樣會阻塞 1 秒，放到線程中與各服務統計查詢並行執行
+        # (實際應用中代理和 API 統計應該從相應服務獲取)
+        cpu_percent, proxy_count, api_requests_per_minute, error_rate = await asyncio.gather(
+            asyncio.to_thread(psutil.cpu_percent, interval=1),
+            self._get_proxy_count(),
+            self._get_api_requests_per_minute(),
+            self._get_error_rate(),
+        )
         
         # 記憶體使用
         memory = psutil.virtual_memory()
@@ -146,7 +195,7 @@ class SystemMonitor:
         network_recv = network.bytes_recv
         
         # 計算網路速度
-        current_time = time.time()
+        current_time = time.monotonic()  # 單調時鐘，不受系統時間調整影響
         if self._last_network_check and self._network_baseline:
             time_diff = current_time - self._last_network_check
             if time_diff > 0:
@@ -164,11 +213,6 @@ class SystemMonitor:
         # 活躍連接數
         connections = len(psutil.net_connections())
         
-        # 模擬代理和 API 統計 (實際應用中應該從相應服務獲取)
-        proxy_count = await self._get_proxy_count()
-        api_requests_per_minute = await self._get_api_requests_per_minute()
-        error_rate = await self._get_error_rate()
-        
         return SystemMetrics(
             timestamp=datetime.now(),
             cpu_percent=cpu_percent,
@@ -262,7 +306,7 @@ class SystemMonitor:
         """處理告警"""
         # 檢查是否已存在相同告警
         existing_alert = next(
-            (a for a in self.active_alerts if a.title == alert.title and not a.resolved),
+            (a for a in self._open_alerts.values() if a.title == alert.title),
             None
         )
         
@@ -274,6 +318,7 @@ class SystemMonitor:
         
         # 添加新告警
         self.active_alerts.append(alert)
+        self._open_alerts[alert.id] = alert
         
         # 觸發告警回調
         for callback in self.alert_callbacks:
@@ -282,20 +327,31 @@ class SystemMonitor:
             except Exception as e:
                 logger.error(f"❌ 告警回調執行失敗: {e}")
         
+        if self._async_alert_callbacks:
+            results = await asyncio.gather(
+                *(callback(alert) for callback in self._async_alert_callbacks),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"❌ 告警回調執行失敗: {result}")
+        
         logger.warning(f"🚨 系統告警: {alert.title} - {alert.message}")
     
-    def add_alert_callback(self, callback: Callable[[Alert], None]):
-        """添加告警回調函數"""
-        self.alert_callbacks.append(callback)
+    def add_alert_callback(self, callback: Callable[[Alert], Any]):
+        """添加告警回調函數（支援同步與異步函數）"""
+        if asyncio.iscoroutinefunction(callback):
+            self._async_alert_callbacks.append(callback)
+        else:
+            self.alert_callbacks.append(callback)
     
     def resolve_alert(self, alert_id: str):
         """解決告警"""
-        for alert in self.active_alerts:
-            if alert.id == alert_id and not alert.resolved:
-                alert.resolved = True
-                alert.resolved_at = datetime.now()
-                logger.info(f"✅ 告警已解決: {alert.title}")
-                break
+        alert = self._open_alerts.pop(alert_id, None)
+        if alert is not None:
+            alert.resolved = True
+            alert.resolved_at = datetime.now()
+            logger.info(f"✅ 告警已解決: {alert.title}")
     
     def get_current_metrics(self) -> Optional[SystemMetrics]:
         """獲取當前指標"""
@@ -304,59 +360,155 @@ class SystemMonitor:
     def get_metrics_history(self, hours: int = 24) -> List[SystemMetrics]:
         """獲取指標歷史"""
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        return [m for m in self.metrics_history if m.timestamp >= cutoff_time]
+        return self.metrics_history[self._metrics_index(cutoff_time):]
+    
+    def _metrics_index(self, cutoff_time: datetime) -> int:
+        """二分查找第一個不早於 cutoff_time 的指標（metrics_history 按時間順序追加）"""
+        return bisect_left(self.metrics_history, cutoff_time, key=_timestamp_of)
+    
+    def _update_rollup(self, metrics: SystemMetrics):
+        """將採樣累加到所屬的小時匯總"""
+        bucket_start = metrics.timestamp.replace(minute=0, second=0, microsecond=0)
+        rollup = self.hourly_rollups.get(bucket_start)
+        if rollup is None:
+            rollup = self.hourly_rollups[bucket_start] = MetricsRollup(bucket_start)
+        rollup.add(metrics)
+    
+    def get_metrics_rollups(self, hours: int = 24) -> List[MetricsRollup]:
+        """獲取最近 hours 個小時桶的匯總（含當前未完成的小時）"""
+        current_bucket = datetime.now().replace(minute=0, second=0, microsecond=0)
+        cutoff_time = current_bucket - timedelta(hours=hours - 1)
+        return [r for start, r in sorted(self.hourly_rollups.items()) if start >= cutoff_time]
+    
+    def get_metrics_averages(self, hours: int = 24) -> Dict[str, float]:
+        """根據小時匯總計算平均值"""
+        rollups = self.get_metrics_rollups(hours)
+        count = sum(r.count for r in rollups)
+        if not count:
+            return {"cpu_percent": 0, "memory_percent": 0, "disk_percent": 0, "error_rate": 0}
+        return {
+            "cpu_percent": sum(r.cpu_sum for r in rollups) / count,
+            "memory_percent": sum(r.memory_sum for r in rollups) / count,
+            "disk_percent": sum(r.disk_sum for r in rollups) / count,
+            "error_rate": sum(r.error_rate_sum for r in rollups) / count,
+        }
     
     def get_active_alerts(self) -> List[Alert]:
         """獲取活躍告警"""
-        return [a for a in self.active_alerts if not a.resolved]
+        return list(self._open_alerts.values())
     
     def get_alert_history(self, hours: int = 24) -> List[Alert]:
         """獲取告警歷史"""
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        return [a for a in self.active_alerts if a.timestamp >= cutoff_time]
+        # 告警同樣按時間順序追加，清理時保持順序
+        return self.active_alerts[bisect_left(self.active_alerts, cutoff_time, key=_timestamp_of):]
     
     def _cleanup_old_data(self):
         """清理舊數據"""
         cutoff_time = datetime.now() - timedelta(days=self.config.data_retention_days)
         
         # 清理指標歷史
-        self.metrics_history = [m for m in self.metrics_history if m.timestamp >= cutoff_time]
+        del self.metrics_history[:self._metrics_index(cutoff_time)]
+        
+        # 清理過期的小時匯總：桶按時間順序建立，只需從最舊一端逐個彈出
+        expire_before = cutoff_time - timedelta(hours=1)
+        while self.hourly_rollups:
+            oldest_bucket = next(iter(self.hourly_rollups))
+            if oldest_bucket >= expire_before:
+                break
+            del self.hourly_rollups[oldest_bucket]
         
         # 清理已解決的告警
         self.active_alerts = [a for a in self.active_alerts if not a.resolved or a.timestamp >= cutoff_time]
+        
+        # 指標文件按日期分片，過期分片整檔刪除，每天檢查一次即可
+        if self._purged_day != cutoff_time.date():
+            self._purge_metric_files(cutoff_time.date())
+            self._purged_day = cutoff_time.date()
+    
+    def _purge_metric_files(self, cutoff_day: date):
+        """刪除早於 cutoff_day 的每日指標文件"""
+        for metrics_file in self.data_dir.glob("metrics_*.json"):
+            try:
+                file_day = datetime.strptime(metrics_file.stem[len("metrics_"):], "%Y%m%d").date()
+            except ValueError:
+                continue
+            if file_day < cutoff_day:
+                try:
+                    metrics_file.unlink()
+                    logger.info(f"🗑️ 已刪除過期指標文件: {metrics_file.name}")
+                except OSError as e:
+                    logger.error(f"❌ 刪除指標文件失敗: {e}")
     
     async def _save_metrics(self, metrics: SystemMetrics):
-        """保存指標數據"""
-        try:
-            # 保存到文件
-            metrics_file = self.data_dir / f"metrics_{datetime.now().strftime('%Y%m%d')}.json"
-            
-            # 讀取現有數據
-            if metrics_file.exists():
-                with open(metrics_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                data = {"metrics": []}
-            
-            # 添加新指標
-            data["metrics"].append(asdict(metrics))
-            
-            # 保存數據
-            with open(metrics_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2, default=str)
-            
-        except Exception as e:
-            logger.error(f"❌ 保存指標數據失敗: {e}")
+        """緩衝指標數據，達到數量或時間閾值時批量寫入文件"""
+        if not self._pending_metrics:
+            self._pending_since = time.monotonic()
+        self._pending_metrics.append(metrics)
+        
+        if (len(self._pending_metrics) >= self.config.metrics_flush_size
+                or time.monotonic() - self._pending_since >= self.config.metrics_flush_interval):
+            self._flush_metrics()
+    
+    def _flush_metrics(self) -> int:
+        """將緩衝中的指標寫入文件"""
+        pending, self._pending_metrics = self._pending_metrics, []
+        self._pending_since = None
+        return self._save_metrics_many(pending)
+    
+    def _save_metrics_many(self, metrics_list: List[SystemMetrics]) -> int:
+        """批量保存指標數據，每個日期文件只讀寫一次
+        
+        Returns:
+            成功寫入的指標數量
+        """
+        by_day: Dict[str, List[SystemMetrics]] = {}
+        for metrics in metrics_list:
+            by_day.setdefault(metrics.timestamp.strftime('%Y%m%d'), []).append(metrics)
+        
+        saved = 0
+        for day, day_metrics in by_day.items():
+            try:
+                metrics_file = self.data_dir / f"metrics_{day}.json"
+                
+                # 讀取現有數據
+                if metrics_file.exists():
+                    with open(metrics_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                else:
+                    data = {"metrics": []}
+                
+                # 添加新指標
+                data["metrics"].extend(asdict(m) for m in day_metrics)
+                
+                # 保存數據
+                with open(metrics_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+                saved += len(day_metrics)
+                
+            except Exception as e:
+                logger.error(f"❌ 保存指標數據失敗: {e}")
+        
+        return saved
     
     def stop_monitoring(self):
         """停止監控"""
         self.is_running = False
+        if self._monitor_task and not self._monitor_task.done():
+            self._monitor_task.cancel()
+        self._flush_metrics()
         logger.info("🛑 系統監控已停止")
+
+    async def shutdown(self):
+        """停止監控並等待後台任務真正結束，避免關閉時遺留 pending 任務"""
+        self.stop_monitoring()
+        tasks = [self._monitor_task] if self._monitor_task else []
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._monitor_task = None
     
     def get_system_health(self) -> Dict[str, Any]:
         """獲取系統健康狀態"""
         current_metrics = self.get_current_metrics()
-        active_alerts = self.get_active_alerts()
         
         if not current_metrics:
             return {
@@ -399,7 +551,7 @@ class SystemMonitor:
             "status": status,
             "health_score": health_score,
             "issues": issues,
-            "active_alerts": len(active_alerts),
+            "active_alerts": len(self._open_alerts),
             "current_metrics": asdict(current_metrics),
             "timestamp": datetime.now().isoformat()
         }
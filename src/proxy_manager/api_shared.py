@@ -11,7 +11,7 @@ Route modules should import from here to avoid circular imports.
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, Iterable, List, Literal
 import asyncio
 import logging
 
@@ -62,7 +62,9 @@ class ProxyNodeResponse(BaseModel):
 
     @classmethod
     def from_proxy_node(cls, proxy: ProxyNode) -> "ProxyNodeResponse":
-        return cls(
+        # 信任邊界：ProxyNode 為內部已建模的資料，欄位型別已確定，直接構造跳過驗證；
+        # 外部輸入（請求體、查詢參數）仍走正常的模型驗證
+        return cls.model_construct(
             host=proxy.host,
             port=proxy.port,
             protocol=proxy.protocol.value,
@@ -91,10 +93,10 @@ class ProxyFilterRequest(BaseModel):
     def filter(self) -> ProxyFilter:
         protocols = None
         if self.protocols:
-            protocols = [ProxyProtocol(p) for p in self.protocols if p in [e.value for e in ProxyProtocol]]
+            protocols = [_PROTOCOL_BY_VALUE[p] for p in self.protocols if p in _PROTOCOL_BY_VALUE]
         anonymity_levels = None
         if self.anonymity_levels:
-            anonymity_levels = [ProxyAnonymity(a) for a in self.anonymity_levels if a in [e.value for e in ProxyAnonymity]]
+            anonymity_levels = [_ANONYMITY_BY_VALUE[a] for a in self.anonymity_levels if a in _ANONYMITY_BY_VALUE]
         return ProxyFilter(
             protocols=protocols,
             anonymity_levels=anonymity_levels,
@@ -132,7 +134,7 @@ class FetchRequest(BaseModel):
 
 
 class ExportRequest(BaseModel):
-    format_type: str = Field(default="json", pattern="^(json|txt|csv)$")
+    format_type: Literal["json", "txt", "csv", "ndjson", "ndjson.gz"] = "json"
     pool_types: Optional[List[str]] = None
     filename: Optional[str] = None
 
@@ -200,6 +202,28 @@ def get_proxy_manager() -> "ProxyManager":
 
 
 # ---------- Utility ----------
+# 池名稱查表，避免在每個路由中重複 if/elif 分支
+_POOL_TYPE_BY_NAME: Dict[str, PoolType] = {
+    PoolType.HOT.value: PoolType.HOT,
+    PoolType.WARM.value: PoolType.WARM,
+    PoolType.COLD.value: PoolType.COLD,
+}
+DEFAULT_POOL_TYPES = (PoolType.HOT, PoolType.WARM, PoolType.COLD)
+# 協議/匿名度值查表，篩選請求不必每個元素都重建枚舉值列表
+_PROTOCOL_BY_VALUE: Dict[str, ProxyProtocol] = {protocol.value: protocol for protocol in ProxyProtocol}
+_ANONYMITY_BY_VALUE: Dict[str, ProxyAnonymity] = {level.value: level for level in ProxyAnonymity}
+
+
+def parse_pool_types(names: Optional[Iterable[str]]) -> List[PoolType]:
+    """將池名稱（hot/warm/cold）轉為 PoolType 列表，無有效名稱時返回全部可用池"""
+    pool_types = []
+    for name in names or ():
+        pool_type = _POOL_TYPE_BY_NAME.get(name.strip().lower())
+        if pool_type is not None:
+            pool_types.append(pool_type)
+    return pool_types or list(DEFAULT_POOL_TYPES)
+
+
 class RateLimiter:
     def __init__(self, max_requests: int = 300, window_seconds: int = 60):
         self.max_requests = max_requests
@@ -247,4 +271,6 @@ __all__ = [
     "VALIDATION_ANONYMITY_COUNT",
     "VALIDATION_GEO_DETECT_COUNT",
     "rate_limit_dependency",
+    "parse_pool_types",
+    "DEFAULT_POOL_TYPES",
 ]
@@ -31,6 +31,56 @@ class ProxyQueryResult:
     has_prev: bool
 
 
+# GROUPING(protocol, anonymity, country) 的位元值：未參與分組的欄位對應位元為 1
+_GROUPED_BY_PROTOCOL = 0b011
+_GROUPED_BY_ANONYMITY = 0b101
+
+# 模型狀態與資料庫 proxy_status 列舉值不一致的映射
+_DB_STATUS_VALUES = {ProxyStatus.BLACKLISTED: 'banned'}
+
+
+def _build_filter_conditions(filter_criteria: Optional[ProxyFilter]) -> Tuple[List[str], List[Any]]:
+    """將 ProxyFilter 轉為參數化的 WHERE 條件與參數列表"""
+    conditions: List[str] = []
+    params: List[Any] = []
+    if not filter_criteria:
+        return conditions, params
+    
+    def add(template: str, value: Any) -> None:
+        params.append(value)
+        conditions.append(template.format(f"${len(params)}"))
+    
+    if filter_criteria.protocols:
+        add("protocol = ANY({})", [p.value for p in filter_criteria.protocols])
+    
+    if filter_criteria.anonymity_levels:
+        add("anonymity = ANY({})", [a.value for a in filter_criteria.anonymity_levels])
+    
+    if filter_criteria.countries:
+        add("country = ANY({})", filter_criteria.countries)
+    
+    if filter_criteria.status:
+        add("status = ANY({})", [_DB_STATUS_VALUES.get(s, s.value) for s in filter_criteria.status])
+    
+    if filter_criteria.min_score is not None:
+        add("score >= {}", filter_criteria.min_score)
+    
+    if filter_criteria.max_response_time is not None:
+        add("response_time_ms <= {}", filter_criteria.max_response_time)
+    
+    if filter_criteria.min_success_rate is not None:
+        add("success_rate >= {}", filter_criteria.min_success_rate)
+    
+    if filter_criteria.tags:
+        add(
+            "EXISTS (SELECT 1 FROM proxy_node_tags nt JOIN proxy_tags t ON t.id = nt.tag_id "
+            "WHERE nt.proxy_id = proxy_nodes.id AND t.name = ANY({}))",
+            filter_criteria.tags
+        )
+    
+    return conditions, params
+
+
 class DatabaseService:
     """數據庫服務類
     
@@ -107,38 +157,9 @@ class DatabaseService:
         if not self.db_pool:
             raise RuntimeError("數據庫連接池未初始化")
         
-        # 構建查詢條件
-        where_conditions = []
-        params = []
-        param_count = 0
-        
-        if filter_criteria:
-            if filter_criteria.protocols:
-                protocol_values = [p.value for p in filter_criteria.protocols]
-                param_count += 1
-                where_conditions.append(f"protocol = ANY(${param_count})")
-                params.append(protocol_values)
-            
-            if filter_criteria.anonymity_levels:
-                anonymity_values = [a.value for a in filter_criteria.anonymity_levels]
-                param_count += 1
-                where_conditions.append(f"anonymity = ANY(${param_count})")
-                params.append(anonymity_values)
-            
-            if filter_criteria.countries:
-                param_count += 1
-                where_conditions.append(f"country = ANY(${param_count})")
-                params.append(filter_criteria.countries)
-            
-            if filter_criteria.min_score is not None:
-                param_count += 1
-                where_conditions.append(f"score >= ${param_count}")
-                params.append(filter_criteria.min_score)
-            
-            if filter_criteria.max_response_time is not None:
-                param_count += 1
-                where_conditions.append(f"response_time_ms <= ${param_count}")
-                params.append(filter_criteria.max_response_time)
+        # 構建查詢條件（全部下推到 SQL，只傳回符合條件的行）
+        where_conditions, params = _build_filter_conditions(filter_criteria)
+        param_count = len(params)
         
         # 構建WHERE子句
         where_clause = ""
@@ -273,43 +294,37 @@ class DatabaseService:
                     """
                 )
                 
-                # 協議分布
-                protocol_stats = await conn.fetch(
-                    """
-                    SELECT protocol, COUNT(*) as count
-                    FROM proxy_nodes
-                    GROUP BY protocol
-                    ORDER BY count DESC
-                    """
-                )
-                
-                # 匿名度分布
-                anonymity_stats = await conn.fetch(
+                # 協議 / 匿名度 / 國家分布：GROUPING SETS 一次掃描、一次往返取得三組計數
+                distribution_rows = await conn.fetch(
                     """
-                    SELECT anonymity, COUNT(*) as count
+                    SELECT 
+                        protocol, anonymity, country,
+                        GROUPING(protocol, anonymity, country) AS grouping_id,
+                        COUNT(*) as count
                     FROM proxy_nodes
-                    GROUP BY anonymity
+                    GROUP BY GROUPING SETS ((protocol), (anonymity), (country))
                     ORDER BY count DESC
                     """
                 )
                 
-                # 國家分布（前10）
-                country_stats = await conn.fetch(
-                    """
-                    SELECT country, COUNT(*) as count
-                    FROM proxy_nodes
-                    WHERE country IS NOT NULL
-                    GROUP BY country
-                    ORDER BY count DESC
-                    LIMIT 10
-                    """
-                )
+                protocol_distribution = []
+                anonymity_distribution = []
+                country_distribution = []
+                for row in distribution_rows:
+                    grouping_id = row['grouping_id']
+                    if grouping_id == _GROUPED_BY_PROTOCOL:
+                        protocol_distribution.append({'protocol': row['protocol'], 'count': row['count']})
+                    elif grouping_id == _GROUPED_BY_ANONYMITY:
+                        anonymity_distribution.append({'anonymity': row['anonymity'], 'count': row['count']})
+                    elif row['country'] is not None:
+                        country_distribution.append({'country': row['country'], 'count': row['count']})
                 
                 return {
                     'basic': dict(basic_stats) if basic_stats else {},
-                    'protocol_distribution': [dict(row) for row in protocol_stats],
-                    'anonymity_distribution': [dict(row) for row in anonymity_stats],
-                    'country_distribution': [dict(row) for row in country_stats],
+                    'protocol_distribution': protocol_distribution,
+                    'anonymity_distribution': anonymity_distribution,
+                    # 國家分布（前10）
+                    'country_distribution': country_distribution[:10],
                     'last_updated': datetime.now().isoformat()
                 }
                 
@@ -12,7 +12,7 @@ import aiohttp
 import json
 import math
 import time
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, TYPE_CHECKING
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import logging
@@ -30,6 +30,9 @@ from geopy.geocoders import Nominatim
 from .models import ProxyNode, ProxyStatus
 from .config import get_config
 
+if TYPE_CHECKING:
+    from .pools import ProxyPoolManager
+
 logger = logging.getLogger(__name__)
 
 
@@ -201,6 +204,9 @@ class EnhancedGeolocationDetector:
         
         # 地理編碼器
         self.geocoder = Nominatim(user_agent="proxy-manager")
+        
+        # 進行中的檢測：同一 IP 的並發查詢共用一次檢測結果
+        self._inflight: Dict[Tuple[str, bool], asyncio.Future] = {}
     
     async def __aenter__(self):
         """異步上下文管理器入口"""
@@ -225,6 +231,17 @@ class EnhancedGeolocationDetector:
         Returns:
             地理位置信息
         """
+        key = (ip, use_cache)
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._detect_location(ip, use_cache))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield：單一呼叫者被取消時不影響其他等待同一結果的呼叫者
+        return await asyncio.shield(pending)
+    
+    async def _detect_location(self, ip: str, use_cache: bool) -> Optional[GeolocationInfo]:
+        """實際執行緩存查詢與多數據源檢測"""
         # 檢查緩存
         if use_cache:
             cached_info = await self.cache.get(ip)
@@ -273,7 +290,12 @@ class EnhancedGeolocationDetector:
         if not GEOIP2_AVAILABLE:
             logger.warning("⚠️ GeoIP2 不可用，跳過地理位置檢測")
             return None
-            
+        
+        # mmdb 開檔與查詢都是同步阻塞操作，丟到執行緒池避免卡住事件循環
+        return await asyncio.to_thread(self._lookup_geoip, ip)
+    
+    def _lookup_geoip(self, ip: str) -> Optional[GeolocationInfo]:
+        """同步查詢 GeoIP 數據庫（於工作執行緒中執行）"""
         try:
             with geoip2.database.Reader(str(self.geoip_db_path)) as reader:
                 response = reader.city(ip)
@@ -495,8 +517,8 @@ class EnhancedGeolocationDetector:
                 except Exception as e:
                     logger.error(f"檢測 {ip} 地理位置失敗: {e}")
         
-        # 執行批量檢測
-        tasks = [detect_single(ip) for ip in ips]
+        # 執行批量檢測（重複 IP 只檢測一次）
+        tasks = [detect_single(ip) for ip in dict.fromkeys(ips)]
         await asyncio.gather(*tasks, return_exceptions=True)
         
         logger.info(f"批量檢測完成: {len(results)}/{len(ips)} 成功")
@@ -532,11 +554,13 @@ class EnhancedGeolocationDetector:
             routing_score=routing_score
         )
     
-    async def enhance_proxy_with_location(self, proxy: ProxyNode) -> ProxyNode:
+    async def enhance_proxy_with_location(self, proxy: ProxyNode,
+                                          pool_manager: Optional['ProxyPoolManager'] = None) -> ProxyNode:
         """為代理節點添加地理位置信息
         
         Args:
             proxy: 代理節點
+            pool_manager: 代理所在的池管理器；代理已在池中時必須傳入，以便更新標籤索引
             
         Returns:
             增強後的代理節點
@@ -572,6 +596,8 @@ class EnhancedGeolocationDetector:
                     proxy.tags.append(f"city:{location_info.city.lower().replace(' ', '-')}")
                 if location_info.isp:
                     proxy.tags.append(f"isp:{location_info.isp.lower().replace(' ', '-')}")
+                if pool_manager is not None:
+                    await pool_manager.reindex_tags(proxy)
                 
                 logger.debug(f"為代理 {proxy.host}:{proxy.port} 添加地理位置信息: {location_info.country}, {location_info.city}")
             
@@ -726,12 +752,10 @@ class IntelligentProxyRouter:
             )
             scored_proxies.append((proxy, score))
         
-        # 按評分排序
-        scored_proxies.sort(key=lambda x: x[1], reverse=True)
-        
         # 記錄路由決策
         if scored_proxies:
-            best_proxy, best_score = scored_proxies[0]
+            # 只需最高分者，單次掃描即可，無需整體排序
+            best_proxy, best_score = max(scored_proxies, key=lambda x: x[1])
             self.routing_history.append({
                 "timestamp": datetime.now().isoformat(),
                 "target_url": target_url,
@@ -10,7 +10,8 @@
 import asyncio
 import json
 import logging
-from typing import List, Optional, Dict, Any, Union
+import zlib
+from typing import List, Optional, Dict, Any, Set, Union
 from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass
@@ -43,6 +44,13 @@ ProxyManagerConfig = ConfigClass
 class ProxyManager:
     """代理管理器主類"""
     
+    # 導出格式 -> 寫出方法名稱（ndjson 系列為串流寫出，另行處理）
+    _EXPORT_WRITERS: Dict[str, str] = {
+        "json": "_write_json_export",
+        "txt": "_write_txt_export",
+        "csv": "_write_csv_export",
+    }
+    
     def __init__(self, config: Optional[ProxyManagerConfig] = None):
         self.config = config or ProxyManagerConfig()
 
@@ -72,7 +80,8 @@ class ProxyManager:
 
         # 狀態與控制
         self._running = False
-        self._tasks: List[asyncio.Task] = []
+        # 背景任務強引用集合；任務結束時由 done callback 自動移除
+        self._tasks: Set[asyncio.Task] = set()
         self._fetch_lock = asyncio.Lock()
         self._heartbeat: Dict[str, Any] = {}
         self._task_registry: Dict[str, Dict[str, Any]] = {}
@@ -106,7 +115,7 @@ class ProxyManager:
             await self._start_auto_tasks()
 
             # 註冊心跳維護任務
-            self._tasks.append(asyncio.create_task(self._heartbeat_loop()))
+            self._track_task(asyncio.create_task(self._heartbeat_loop()))
             
             self._running = True
             self.stats['start_time'] = datetime.now()
@@ -127,13 +136,14 @@ class ProxyManager:
         
         self._running = False
         
-        # 取消所有任務
-        for task in self._tasks:
+        # 取消所有任務（快照後再操作，done callback 會同時從集合中移除）
+        tasks = list(self._tasks)
+        for task in tasks:
             task.cancel()
         
         # 等待任務完成
-        if self._tasks:
-            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
         
         self._tasks.clear()
         
@@ -149,7 +159,7 @@ class ProxyManager:
             try:
                 self._heartbeat = {
                     'timestamp': datetime.now().isoformat(),
-                    'active_tasks': len([t for t in self._tasks if not t.done()]),
+                    'active_tasks': len(self._tasks),
                     'stats_updates': self.stats.get('last_update'),
                 }
                 await asyncio.sleep(5)
@@ -163,20 +173,25 @@ class ProxyManager:
         """獲取系統任務與心跳狀態。"""
         registry_snapshot = {}
         for name, meta in self._task_registry.items():
-            ms = meta.copy()
-            task: asyncio.Task = ms.get('task')  # type: ignore
+            task = meta.get('task')
+            if isinstance(task, asyncio.Task) and task.done() and 'ended_at' not in meta:
+                # 結束時間寫回註冊表，後續查詢保持穩定
+                meta['ended_at'] = datetime.now().isoformat()
+            entry = {key: value for key, value in meta.items() if key != 'task'}
             if isinstance(task, asyncio.Task):
-                ms['done'] = task.done()
-                ms['cancelled'] = task.cancelled()
-                if task.done() and 'ended_at' not in ms:
-                    ms['ended_at'] = datetime.now().isoformat()
-            ms.pop('task', None)
-            registry_snapshot[name] = ms
+                entry['done'] = task.done()
+                entry['cancelled'] = task.cancelled()
+            registry_snapshot[name] = entry
         return {
             'heartbeat': self._heartbeat,
             'tasks': registry_snapshot,
         }
 
+    def _track_task(self, task: asyncio.Task):
+        """持有背景任務引用，任務結束後自動釋放"""
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
     def _register_task(self, name: str, task: asyncio.Task):
         """註冊背景任務供監控。"""
         self._task_registry[name] = {
@@ -197,7 +212,7 @@ class ProxyManager:
             )
         
         # 初始化驗證器
-        self.validator = ProxyValidator(self.config.validation)
+        self.validator = ProxyValidator(timeout=self.config.validation.timeout)
         
         self.batch_validator = BatchValidator(
             self.config.validation,
@@ -220,16 +235,13 @@ class ProxyManager:
     async def _start_auto_tasks(self):
         """啟動自動任務"""
         if self.config.auto_fetch_enabled:
-            task = asyncio.create_task(self._auto_fetch_loop())
-            self._tasks.append(task)
+            self._track_task(asyncio.create_task(self._auto_fetch_loop()))
         
         if self.config.auto_cleanup_enabled:
-            task = asyncio.create_task(self._auto_cleanup_loop())
-            self._tasks.append(task)
+            self._track_task(asyncio.create_task(self._auto_cleanup_loop()))
         
         if self.config.auto_save_enabled:
-            task = asyncio.create_task(self._auto_save_loop())
-            self._tasks.append(task)
+            self._track_task(asyncio.create_task(self._auto_save_loop()))
     
     async def fetch_proxies(self, sources: Optional[List[str]] = None) -> List[ProxyNode]:
         """獲取代理（帶鎖保護避免重入）"""
@@ -248,23 +260,19 @@ class ProxyManager:
                 else:
                     # 從基本 fetcher_manager 聚合
                     fetchers = getattr(self.fetcher_manager, 'fetchers', [])
+                    selected = []
                     for fetcher in fetchers:
                         name = getattr(fetcher, 'name', fetcher.__class__.__name__)
                         if sources and name not in sources:
                             continue
-                        try:
-                            result = await fetcher.fetch()
-                            if result:
-                                all_proxies.extend(result)
-                                if FETCH_SOURCE_COUNT:
-                                    FETCH_SOURCE_COUNT.labels(source=name, outcome="success").inc()
-                            else:
-                                if FETCH_SOURCE_COUNT:
-                                    FETCH_SOURCE_COUNT.labels(source=name, outcome="empty").inc()
-                        except Exception as fe:  # noqa: BLE001
-                            logger.warning(f"單一 fetcher 失敗: {fe}")
-                            if FETCH_SOURCE_COUNT:
-                                FETCH_SOURCE_COUNT.labels(source=name, outcome="error").inc()
+                        selected.append((name, fetcher))
+                    # 各來源並發獲取，總耗時取決於最慢的來源而非所有來源之和；
+                    # 每個來源的錯誤在各自協程內處理，不影響其他來源
+                    results = await asyncio.gather(
+                        *(self._fetch_from_source(name, fetcher, FETCH_SOURCE_COUNT) for name, fetcher in selected)
+                    )
+                    for result in results:
+                        all_proxies.extend(result)
                 if not all_proxies:
                     logger.info("未獲取到任何代理")
                     return []
@@ -297,6 +305,21 @@ class ProxyManager:
                 logger.error(f"❌ 獲取代理失敗: {e}")
                 raise
     
+    async def _fetch_from_source(self, name: str, fetcher: Any, source_counter: Any = None) -> List[ProxyNode]:
+        """從單一來源獲取代理，失敗時記錄並回傳空列表"""
+        try:
+            result = await fetcher.fetch_proxies()
+        except Exception as fe:  # noqa: BLE001
+            logger.warning(f"單一 fetcher 失敗: {name}: {fe}")
+            if hasattr(fetcher, 'fetch_errors'):
+                fetcher.fetch_errors += 1
+            if source_counter:
+                source_counter.labels(source=name, outcome="error").inc()
+            return []
+        if source_counter:
+            source_counter.labels(source=name, outcome="success" if result else "empty").inc()
+        return result or []
+    
     async def get_proxy(self, 
                        filter_criteria: Optional[ProxyFilter] = None,
                        pool_preference: Optional[List[PoolType]] = None) -> Optional[ProxyNode]:
@@ -440,7 +463,7 @@ class ProxyManager:
         if not self._running:
             return
         task = asyncio.create_task(self.background_sync_to_etl(pool_types))
-        self._tasks.append(task)
+        self._track_task(task)
         self._register_task(f"etl_sync_{datetime.now().strftime('%H%M%S')}", task)
     
     async def export_proxies(self, 
@@ -451,65 +474,116 @@ class ProxyManager:
         if pool_types is None:
             pool_types = [PoolType.HOT, PoolType.WARM, PoolType.COLD]
         
-        all_proxies = []
-        for pool_type in pool_types:
-            if pool_type in self.pool_manager.pools:
-                pool = self.pool_manager.pools[pool_type]
-                active_proxies = [
-                    proxy for proxy in pool.proxies.values() 
-                    if proxy.status == ProxyStatus.ACTIVE
-                ]
-                all_proxies.extend(active_proxies)
-        
-        if format_type.lower() == "json":
-            data = {
-                'timestamp': datetime.now().isoformat(),
-                'total_count': len(all_proxies),
-                'proxies': [proxy.to_dict() for proxy in all_proxies]
-            }
-            
-            async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, ensure_ascii=False, indent=2, default=str))
+        fmt = format_type.lower()
+        if fmt == "ndjson":
+            return await self._export_proxies_ndjson(file_path, pool_types)
         
-        elif format_type.lower() == "txt":
-            lines = []
-            for proxy in all_proxies:
-                lines.append(f"{proxy.host}:{proxy.port}")
-            
-            async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write('\n'.join(lines))
+        if fmt == "ndjson.gz":
+            return await self._export_proxies_ndjson(file_path, pool_types, compress=True)
         
-        elif format_type.lower() == "csv":
-            import csv
-            import io
-            
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # 寫入標題
-            writer.writerow(['host', 'port', 'protocol', 'anonymity', 'country', 'score', 'response_time'])
-            
-            # 寫入數據
-            for proxy in all_proxies:
-                writer.writerow([
-                    proxy.host,
-                    proxy.port,
-                    proxy.protocol.value,
-                    proxy.anonymity.value,
-                    proxy.country or '',
-                    proxy.score,
-                    proxy.metrics.avg_response_time or 0
-                ])
-            
-            async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write(output.getvalue())
-        
-        else:
+        writer_name = self._EXPORT_WRITERS.get(fmt)
+        if writer_name is None:
             raise ValueError(f"不支持的格式: {format_type}")
         
+        all_proxies = self._snapshot_active_proxies(pool_types)
+        await getattr(self, writer_name)(file_path, all_proxies)
+        
         logger.info(f"📤 已導出 {len(all_proxies)} 個代理到: {file_path}")
         return len(all_proxies)
     
+    async def _write_json_export(self, file_path: Path, proxies: List[ProxyNode]):
+        """寫出 JSON 格式"""
+        data = {
+            'timestamp': datetime.now().isoformat(),
+            'total_count': len(proxies),
+            'proxies': [proxy.to_dict() for proxy in proxies]
+        }
+        
+        async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
+            await f.write(json.dumps(data, ensure_ascii=False, indent=2, default=str))
+    
+    async def _write_txt_export(self, file_path: Path, proxies: List[ProxyNode]):
+        """寫出 host:port 純文本格式"""
+        async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
+            await f.write('\n'.join(f"{proxy.host}:{proxy.port}" for proxy in proxies))
+    
+    async def _write_csv_export(self, file_path: Path, proxies: List[ProxyNode]):
+        """寫出 CSV 格式"""
+        import csv
+        import io
+        
+        output = io.StringIO()
+        writer = csv.writer(output)
+        
+        # 寫入標題
+        writer.writerow(['host', 'port', 'protocol', 'anonymity', 'country', 'score', 'response_time'])
+        
+        # 寫入數據
+        for proxy in proxies:
+            writer.writerow([
+                proxy.host,
+                proxy.port,
+                proxy.protocol.value,
+                proxy.anonymity.value,
+                proxy.country or '',
+                proxy.score,
+                proxy.metrics.avg_response_time or 0
+            ])
+        
+        async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
+            await f.write(output.getvalue())
+    
+    def _snapshot_active_proxies(self, pool_types: List[PoolType]) -> List[ProxyNode]:
+        """依池順序取得活躍代理快照
+        
+        須在第一個 await 之前同步完成：導出期間其他協程可能增刪池內代理，
+        直接迭代池字典會在寫檔讓出控制權後觸發「dictionary changed size」錯誤。
+        """
+        snapshot: List[ProxyNode] = []
+        for pool_type in pool_types:
+            pool = self.pool_manager.pools.get(pool_type)
+            if pool is None:
+                continue
+            snapshot.extend(proxy for proxy in list(pool.proxies.values())
+                            if proxy.status == ProxyStatus.ACTIVE)
+        return snapshot
+    
+    async def _export_proxies_ndjson(self, file_path: Path, pool_types: List[PoolType],
+                                     batch_size: int = 500, compress: bool = False) -> int:
+        """以 NDJSON（每行一個代理）分批寫出，不構建完整列表和 JSON 文檔
+        
+        compress 為 True 時每批直接以 gzip（壓縮級別 1）壓縮後寫入，邊產出邊壓縮。
+        """
+        proxies = self._snapshot_active_proxies(pool_types)
+        count = 0
+        lines: List[str] = []
+        # wbits=31 輸出 gzip 容器格式；級別 1 的 CPU 開銷遠低於預設級別 6
+        compressor = zlib.compressobj(1, zlib.DEFLATED, 31) if compress else None
+        
+        async with aiofiles.open(file_path, 'wb' if compress else 'w',
+                                 encoding=None if compress else 'utf-8') as f:
+            async def write_batch() -> None:
+                chunk = '\n'.join(lines) + '\n'
+                if compressor is not None:
+                    await f.write(compressor.compress(chunk.encode('utf-8')))
+                else:
+                    await f.write(chunk)
+            
+            for proxy in proxies:
+                lines.append(json.dumps(proxy.to_dict(), ensure_ascii=False, default=str))
+                if len(lines) >= batch_size:
+                    await write_batch()
+                    count += len(lines)
+                    lines.clear()
+            if lines:
+                await write_batch()
+                count += len(lines)
+            if compressor is not None:
+                await f.write(compressor.flush())
+        
+        logger.info(f"📤 已導出 {count} 個代理到: {file_path}")
+        return count
+    
     async def import_proxies(self, file_path: Path, validate: bool = True) -> int:
         """從文件導入代理"""
         if not file_path.exists():
@@ -6,8 +6,9 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from typing import Callable, Optional, Dict, Any, List
 import json
+import sys
 import time
 
 
@@ -60,7 +61,21 @@ class ScanStatus(Enum):
     UNKNOWN_ERROR = "unknown_error"
 
 
-@dataclass
+# 匿名度評分表（模組級常量，評分時不再每次重建字典）
+_ANONYMITY_SCORES = {
+    ProxyAnonymity.ELITE: 20,
+    ProxyAnonymity.ANONYMOUS: 15,
+    ProxyAnonymity.TRANSPARENT: 5,
+    ProxyAnonymity.UNKNOWN: 0
+}
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """駐留低基數字串（國家、地區、ISP、來源、標籤），大量代理共用同一對象"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
 class ProxyMetrics:
     """代理性能指標"""
     response_time_ms: Optional[int] = None
@@ -72,6 +87,15 @@ class ProxyMetrics:
     last_failure_time: Optional[datetime] = None
     consecutive_failures: int = 0
     
+    @property
+    def avg_response_time(self) -> Optional[int]:
+        """響應時間別名（池選擇、統計與導出沿用此名稱）"""
+        return self.response_time_ms
+    
+    @avg_response_time.setter
+    def avg_response_time(self, value: Optional[int]) -> None:
+        self.response_time_ms = value
+    
     def update_success(self, response_time_ms: int) -> None:
         """更新成功統計"""
         self.total_requests += 1
@@ -95,7 +119,7 @@ class ProxyMetrics:
             self.success_rate = self.successful_requests / self.total_requests
 
 
-@dataclass
+@dataclass(slots=True)
 class ProxyNode:
     """代理節點資料模型"""
     host: str
@@ -114,11 +138,22 @@ class ProxyNode:
     last_checked: Optional[datetime] = None
     tags: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # 以下為衍生欄位：proxy_id 由 host:port 生成，speed 由掃描器測速後寫入
+    proxy_id: str = field(default="", init=False, compare=False)
+    speed: Optional[ProxySpeed] = field(default=None, init=False, compare=False, repr=False)
     
     def __post_init__(self):
         """初始化後處理"""
-        if not hasattr(self, 'proxy_id') or not self.proxy_id:
+        if not self.proxy_id:
             self.proxy_id = f"{self.host}:{self.port}"
+        
+        # 在建構時駐留低基數字串，爬蟲、掃描器與反序列化路徑都共用同一份
+        self.country = _intern(self.country)
+        self.region = _intern(self.region)
+        self.city = _intern(self.city)
+        self.isp = _intern(self.isp)
+        self.source = _intern(self.source)
+        self.tags = [_intern(tag) for tag in self.tags]
     
     @property
     def url(self) -> str:
@@ -163,13 +198,7 @@ class ProxyNode:
                 score += 10
         
         # 匿名度權重 20%
-        anonymity_scores = {
-            ProxyAnonymity.ELITE: 20,
-            ProxyAnonymity.ANONYMOUS: 15,
-            ProxyAnonymity.TRANSPARENT: 5,
-            ProxyAnonymity.UNKNOWN: 0
-        }
-        score += anonymity_scores.get(self.anonymity, 0)
+        score += _ANONYMITY_SCORES.get(self.anonymity, 0)
         
         # 穩定性權重 10%（連續失敗次數的反向）
         if self.metrics.consecutive_failures == 0:
@@ -290,9 +319,63 @@ class ProxyFilter:
             return False
         
         return True
+    
+    def compile(self) -> Callable[[ProxyNode], bool]:
+        """將已設置的條件預先組合成單一判斷函數
+        
+        批量篩選時只檢查實際啟用的條件，列表條件轉為集合以便 O(1) 成員判斷；
+        結果與 matches() 一致。
+        """
+        checks: List[Callable[[ProxyNode], bool]] = []
+        
+        if self.protocols:
+            protocols = frozenset(self.protocols)
+            checks.append(lambda proxy: proxy.protocol in protocols)
+        
+        if self.anonymity_levels:
+            anonymity_levels = frozenset(self.anonymity_levels)
+            checks.append(lambda proxy: proxy.anonymity in anonymity_levels)
+        
+        if self.countries:
+            countries = frozenset(self.countries)
+            checks.append(lambda proxy: proxy.country in countries)
+        
+        if self.min_score is not None:
+            min_score = self.min_score
+            checks.append(lambda proxy: proxy.score >= min_score)
+        
+        if self.max_response_time is not None:
+            max_response_time = self.max_response_time
+            checks.append(lambda proxy: proxy.metrics.response_time_ms is None
+                          or proxy.metrics.response_time_ms <= max_response_time)
+        
+        if self.min_success_rate is not None:
+            min_success_rate = self.min_success_rate
+            checks.append(lambda proxy: proxy.metrics.success_rate >= min_success_rate)
+        
+        if self.status:
+            statuses = frozenset(self.status)
+            checks.append(lambda proxy: proxy.status in statuses)
+        
+        if self.tags:
+            tags = frozenset(self.tags)
+            checks.append(lambda proxy: not tags.isdisjoint(proxy.tags))
+        
+        if not checks:
+            return lambda proxy: True
+        if len(checks) == 1:
+            return checks[0]
+        
+        def predicate(proxy: ProxyNode) -> bool:
+            for check in checks:
+                if not check(proxy):
+                    return False
+            return True
+        
+        return predicate
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanTarget:
     """掃描目標"""
     host: str
@@ -301,7 +384,7 @@ class ScanTarget:
     priority: int = 1  # 1-10, 10為最高優先級
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanResult:
     """掃描結果"""
     target: ScanTarget
@@ -8,9 +8,12 @@
 """
 
 import asyncio
+import heapq
+import itertools
 import random
 import json
-from typing import List, Optional, Dict, Any, Set, Iterator
+import time
+from typing import Callable, List, Optional, Dict, Any, Set, Iterator, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
@@ -90,8 +93,16 @@ class ProxyPool:
         self.pool_type = pool_type
         self.config = config
         self.proxies: Dict[str, ProxyNode] = {}  # key: proxy_id
-        self.usage_queue: deque = deque()  # 使用順序隊列
+        # 使用順序隊列，元素為 (序號, proxy_id)；採惰性刪除，
+        # 只有序號與 _queue_position 一致的項才有效
+        self.usage_queue: deque = deque()
+        self._queue_position: Dict[str, int] = {}
+        self._queue_seq = itertools.count()
         self.last_used: Dict[str, datetime] = {}  # 最後使用時間
+        # 標籤倒排索引：tag -> proxy_id 集合（於加入池時建立），
+        # 並記錄建立索引時的標籤，代理標籤事後被就地修改也能正確移除
+        self._tag_index: Dict[str, Set[str]] = defaultdict(set)
+        self._indexed_tags: Dict[str, Tuple[str, ...]] = {}
         self._lock = asyncio.Lock()
     
     @property
@@ -112,8 +123,13 @@ class ProxyPool:
                 # 池已滿，移除最舊的代理
                 await self._remove_oldest()
             
+            self._unindex_tags(proxy.proxy_id)
             self.proxies[proxy.proxy_id] = proxy
-            self.usage_queue.append(proxy.proxy_id)
+            self._index_tags(proxy)
+            seq = next(self._queue_seq)
+            self._queue_position[proxy.proxy_id] = seq
+            self.usage_queue.append((seq, proxy.proxy_id))
+            self._compact_usage_queue()
             logger.debug(f"✅ 代理 {proxy.url} 已添加到 {self.pool_type.value} 池")
             return True
     
@@ -121,12 +137,10 @@ class ProxyPool:
         """從池中移除代理"""
         async with self._lock:
             if proxy_id in self.proxies:
+                self._unindex_tags(proxy_id)
                 del self.proxies[proxy_id]
-                # 從使用隊列中移除
-                try:
-                    self.usage_queue.remove(proxy_id)
-                except ValueError:
-                    pass
+                # 使用隊列不做 O(n) 移除，過期項由 _remove_oldest 跳過或壓縮時清除
+                self._queue_position.pop(proxy_id, None)
                 # 從最後使用記錄中移除
                 self.last_used.pop(proxy_id, None)
                 logger.debug(f"🗑️ 代理 {proxy_id} 已從 {self.pool_type.value} 池移除")
@@ -136,13 +150,21 @@ class ProxyPool:
     async def get_proxy(self, filter_criteria: Optional[ProxyFilter] = None) -> Optional[ProxyNode]:
         """從池中獲取代理"""
         async with self._lock:
-            available_proxies = []
+            # 篩選可用代理（條件先編譯為單一判斷函數）
+            predicate = filter_criteria.compile() if filter_criteria is not None else None
             
-            # 篩選可用代理
-            for proxy in self.proxies.values():
-                if proxy.status == ProxyStatus.ACTIVE:
-                    if filter_criteria is None or filter_criteria.matches(proxy):
-                        available_proxies.append(proxy)
+            # 有標籤條件時先用倒排索引縮小候選集，避免逐一掃描整個池；
+            # 就地修改標籤後須經 reindex_tags 更新索引
+            if filter_criteria is not None and filter_criteria.tags:
+                candidate_ids = set().union(
+                    *(self._tag_index.get(tag, ()) for tag in filter_criteria.tags)
+                )
+                available_proxies = self._filter_available(
+                    (self.proxies[proxy_id] for proxy_id in candidate_ids if proxy_id in self.proxies),
+                    predicate
+                )
+            else:
+                available_proxies = self._filter_available(self.proxies.values(), predicate)
             
             if not available_proxies:
                 return None
@@ -164,60 +186,104 @@ class ProxyPool:
             
             return proxy
     
+    @staticmethod
+    def _filter_available(proxies, predicate) -> List[ProxyNode]:
+        """篩選活躍且符合條件的代理"""
+        return [
+            proxy for proxy in proxies
+            if proxy.status == ProxyStatus.ACTIVE and (predicate is None or predicate(proxy))
+        ]
+    
     def _round_robin_select(self, proxies: List[ProxyNode]) -> ProxyNode:
         """輪詢選擇代理"""
         if not proxies:
             return None
         
-        # 按最後使用時間排序，選擇最久未使用的
-        proxies_with_time = []
-        for proxy in proxies:
-            last_time = self.last_used.get(proxy.proxy_id, datetime.min)
-            proxies_with_time.append((proxy, last_time))
-        
-        # 排序並選擇最久未使用的
-        proxies_with_time.sort(key=lambda x: x[1])
-        return proxies_with_time[0][0]
+        # 只需最久未使用的一個，線性取最小值即可，無需整體排序
+        last_used = self.last_used
+        return min(proxies, key=lambda proxy: last_used.get(proxy.proxy_id, datetime.min))
     
     async def _remove_oldest(self):
         """移除最舊的代理"""
-        if self.usage_queue:
-            oldest_id = self.usage_queue.popleft()
-            self.proxies.pop(oldest_id, None)
+        while self.usage_queue:
+            seq, oldest_id = self.usage_queue.popleft()
+            if self._queue_position.get(oldest_id) != seq:
+                continue  # 已移除或重新加入的過期項
+            self._unindex_tags(oldest_id)
+            del self.proxies[oldest_id]
+            del self._queue_position[oldest_id]
             self.last_used.pop(oldest_id, None)
+            return
+    
+    def _compact_usage_queue(self):
+        """過期項超過一半時重建使用隊列，避免無限增長"""
+        if len(self.usage_queue) > 2 * len(self.proxies) + 16:
+            self.usage_queue = deque(
+                entry for entry in self.usage_queue if self._queue_position.get(entry[1]) == entry[0]
+            )
+    
+    def _index_tags(self, proxy: ProxyNode):
+        """將代理標籤加入倒排索引"""
+        tags = tuple(proxy.tags)
+        self._indexed_tags[proxy.proxy_id] = tags
+        for tag in tags:
+            self._tag_index[tag].add(proxy.proxy_id)
+    
+    def _unindex_tags(self, proxy_id: str):
+        """從倒排索引移除代理標籤（依建立索引時的標籤）"""
+        for tag in self._indexed_tags.pop(proxy_id, ()):
+            ids = self._tag_index.get(tag)
+            if ids is not None:
+                ids.discard(proxy_id)
+                if not ids:
+                    del self._tag_index[tag]
+    
+    async def reindex_tags(self, proxy_id: str) -> bool:
+        """代理標籤被修改後重建其索引項"""
+        async with self._lock:
+            proxy = self.proxies.get(proxy_id)
+            if proxy is None:
+                return False
+            self._unindex_tags(proxy_id)
+            self._index_tags(proxy)
+            return True
     
     def get_stats(self) -> PoolStats:
         """獲取池統計信息"""
         total_count = len(self.proxies)
-        active_proxies = [p for p in self.proxies.values() if p.status == ProxyStatus.ACTIVE]
-        active_count = len(active_proxies)
-        
-        # 計算平均分數和響應時間
-        if active_proxies:
-            avg_score = sum(p.score for p in active_proxies) / active_count
-            response_times = [p.metrics.avg_response_time for p in active_proxies if p.metrics.avg_response_time]
-            avg_response_time = sum(response_times) / len(response_times) if response_times else 0
-            
-            # 成功率
-            total_requests = sum(p.metrics.total_requests for p in active_proxies)
-            successful_requests = sum(p.metrics.successful_requests for p in active_proxies)
-            success_rate = successful_requests / total_requests if total_requests > 0 else 0
-        else:
-            avg_score = 0
-            avg_response_time = 0
-            success_rate = 0
+        active_count = 0
+        score_sum = 0.0
+        response_time_sum = 0
+        response_time_count = 0
+        total_requests = 0
+        successful_requests = 0
         
         # 分佈統計
         protocol_dist = defaultdict(int)
         anonymity_dist = defaultdict(int)
         country_dist = defaultdict(int)
         
-        for proxy in active_proxies:
+        # 單次遍歷累加所有統計量，不構建中間列表
+        for proxy in self.proxies.values():
+            if proxy.status != ProxyStatus.ACTIVE:
+                continue
+            metrics = proxy.metrics
+            active_count += 1
+            score_sum += proxy.score
+            if metrics.response_time_ms:
+                response_time_sum += metrics.response_time_ms
+                response_time_count += 1
+            total_requests += metrics.total_requests
+            successful_requests += metrics.successful_requests
             protocol_dist[proxy.protocol.value] += 1
             anonymity_dist[proxy.anonymity.value] += 1
             if proxy.country:
                 country_dist[proxy.country] += 1
         
+        avg_score = score_sum / active_count if active_count else 0
+        avg_response_time = response_time_sum / response_time_count if response_time_count else 0
+        success_rate = successful_requests / total_requests if total_requests > 0 else 0
+        
         return PoolStats(
             pool_type=self.pool_type,
             total_count=total_count,
@@ -252,7 +318,8 @@ class ProxyPool:
 class ProxyPoolManager:
     """代理池管理器"""
 
-    def __init__(self, config: Optional[PoolConfig] = None):
+    def __init__(self, config: Optional[PoolConfig] = None,
+                 clock: Callable[[], float] = time.monotonic):
         self.config = config or PoolConfig()
         self.pools: Dict[PoolType, ProxyPool] = {
             PoolType.HOT: ProxyPool(PoolType.HOT, self.config),
@@ -263,8 +330,11 @@ class ProxyPoolManager:
         self.validator: Optional[ProxyValidator] = None
         self._balance_task: Optional[asyncio.Task] = None
         self._running = False
-        # 租借機制: proxy_id -> (leased_at, lease_seconds)
-        self._leases: Dict[str, tuple[datetime, int]] = {}
+        # 租借機制: proxy_id -> 到期時間（單調時鐘秒數，時鐘可注入以便測試）
+        self._clock = clock
+        self._leases: Dict[str, float] = {}
+        # 到期時間最小堆 (deadline, proxy_id)，清理時只需查看堆頂
+        self._lease_heap: List[Tuple[float, str]] = []
         self._default_lease_seconds = 30
     
     async def start(self):
@@ -349,11 +419,9 @@ class ProxyPoolManager:
         if pool_preference is None:
             pool_preference = [PoolType.HOT, PoolType.WARM, PoolType.COLD]
         
-        # 清理過期租借
-        now = datetime.now()
-        expired = [pid for pid,(ts,ttl) in self._leases.items() if (now - ts).total_seconds() > ttl]
-        for pid in expired:
-            self._leases.pop(pid, None)
+        # 清理過期租借（單調時鐘直接比較浮點數，不建立 datetime/timedelta 對象）
+        now = self._clock()
+        self._expire_leases(now)
 
         for pool_type in pool_preference:
             if pool_type in self.pools:
@@ -365,7 +433,9 @@ class ProxyPoolManager:
                     lease = self._leases.get(proxy.proxy_id)
                     if lease is None:
                         # 掛上租借
-                        self._leases[proxy.proxy_id] = (datetime.now(), self._default_lease_seconds)
+                        deadline = now + self._default_lease_seconds
+                        self._leases[proxy.proxy_id] = deadline
+                        heapq.heappush(self._lease_heap, (deadline, proxy.proxy_id))
                         logger.debug(f"🎯 從 {pool_type.value} 池租借代理: {proxy.url}")
                         return proxy
                 # 若該池全是租借中的代理則繼續下一個池
@@ -373,6 +443,15 @@ class ProxyPoolManager:
         logger.warning("⚠️ 沒有可用的代理")
         return None
 
+    def _expire_leases(self, now: float):
+        """從堆頂彈出已到期的租借，只處理過期項目而非掃描全部租借"""
+        heap = self._lease_heap
+        while heap and heap[0][0] < now:
+            deadline, pid = heapq.heappop(heap)
+            # 已歸還或重新租借的代理在堆中留有舊項目，以字典中的到期時間為準
+            if self._leases.get(pid) == deadline:
+                del self._leases[pid]
+
     async def return_proxy(self, proxy: ProxyNode):
         """歸還租借代理，提前釋放 lease。"""
         if proxy and proxy.proxy_id in self._leases:
@@ -418,6 +497,11 @@ class ProxyPoolManager:
         else:
             logger.info("✅ 代理池重新平衡完成，無需移動")
     
+    async def reindex_tags(self, proxy: ProxyNode) -> bool:
+        """代理標籤被就地修改（如地理位置標籤）後，更新所在池的標籤索引"""
+        pool = self._find_proxy_pool(proxy.proxy_id)
+        return await pool.reindex_tags(proxy.proxy_id) if pool is not None else False
+    
     def _find_proxy_pool(self, proxy_id: str) -> Optional[ProxyPool]:
         """查找代理所在的池"""
         for pool in self.pools.values():
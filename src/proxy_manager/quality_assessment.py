@@ -12,12 +12,15 @@ import asyncio
 import json
 import time
 import statistics
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import Deque, Dict, List, Optional, Tuple, Any, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 import logging
 import math
+from collections import deque
+from itertools import islice
+from operator import attrgetter
 
 from .models import ProxyNode, ProxyProtocol, ProxyStatus
 from .intelligent_detection import DetectionResult, BenchmarkResult, AnonymityLevel, ProxyType
@@ -62,15 +65,29 @@ class QualityMetrics:
     confidence_level: float = 0.0        # 置信度 (0-1)
 
 
+# 歷史記錄窗口大小（超出後由 deque 自動淘汰最舊記錄）
+_HISTORY_WINDOW = 100
+
+
+def _history_window() -> Deque:
+    """建立固定長度的歷史記錄佇列"""
+    return deque(maxlen=_HISTORY_WINDOW)
+
+
+def _tail(values: Deque, n: int) -> List:
+    """取出佇列最後 n 筆記錄"""
+    return list(islice(values, max(len(values) - n, 0), None))
+
+
 @dataclass
 class HistoricalPerformance:
     """歷史性能記錄"""
     proxy: ProxyNode
-    timestamps: List[datetime] = field(default_factory=list)
-    response_times: List[float] = field(default_factory=list)
-    success_rates: List[float] = field(default_factory=list)
-    quality_scores: List[float] = field(default_factory=list)
-    error_counts: List[int] = field(default_factory=list)
+    timestamps: Deque[datetime] = field(default_factory=_history_window)
+    response_times: Deque[float] = field(default_factory=_history_window)
+    success_rates: Deque[float] = field(default_factory=_history_window)
+    quality_scores: Deque[float] = field(default_factory=_history_window)
+    error_counts: Deque[int] = field(default_factory=_history_window)
     
     # 統計指標
     avg_response_time: float = 0.0
@@ -90,14 +107,6 @@ class HistoricalPerformance:
         self.quality_scores.append(quality_score)
         self.error_counts.append(error_count)
         
-        # 保持最近 100 條記錄
-        if len(self.timestamps) > 100:
-            self.timestamps = self.timestamps[-100:]
-            self.response_times = self.response_times[-100:]
-            self.success_rates = self.success_rates[-100:]
-            self.quality_scores = self.quality_scores[-100:]
-            self.error_counts = self.error_counts[-100:]
-        
         self._update_statistics()
     
     def _update_statistics(self):
@@ -123,7 +132,7 @@ class HistoricalPerformance:
             return
         
         # 使用最近 10 個數據點分析趨勢
-        recent_scores = self.quality_scores[-10:]
+        recent_scores = _tail(self.quality_scores, 10)
         
         # 計算線性回歸斜率
         n = len(recent_scores)
@@ -148,6 +157,16 @@ class HistoricalPerformance:
             self.trend_direction = "stable"
 
 
+# 排序依據 -> 取值函數（attrgetter 為 C 實現，每次排序無需重新構建）
+_SORT_KEYS = {
+    "overall_score": attrgetter("overall_score"),
+    "connectivity": attrgetter("connectivity_score"),
+    "speed": attrgetter("speed_score"),
+    "anonymity": attrgetter("anonymity_score"),
+    "stability": attrgetter("stability_score"),
+}
+
+
 class ProxyQualityAssessor:
     """代理質量評估器
     
@@ -618,20 +637,8 @@ class ProxyQualityAssessor:
         
         # 排序
         try:
-            if sort_by == "overall_score":
-                sorted_metrics = sorted(filtered_metrics, key=lambda x: x.overall_score, reverse=not ascending)
-            elif sort_by == "connectivity":
-                sorted_metrics = sorted(filtered_metrics, key=lambda x: x.connectivity_score, reverse=not ascending)
-            elif sort_by == "speed":
-                sorted_metrics = sorted(filtered_metrics, key=lambda x: x.speed_score, reverse=not ascending)
-            elif sort_by == "anonymity":
-                sorted_metrics = sorted(filtered_metrics, key=lambda x: x.anonymity_score, reverse=not ascending)
-            elif sort_by == "stability":
-                sorted_metrics = sorted(filtered_metrics, key=lambda x: x.stability_score, reverse=not ascending)
-            else:
-                sorted_metrics = sorted(filtered_metrics, key=lambda x: x.overall_score, reverse=not ascending)
-            
-            return sorted_metrics
+            sort_key = _SORT_KEYS.get(sort_by, _SORT_KEYS["overall_score"])
+            return sorted(filtered_metrics, key=sort_key, reverse=not ascending)
             
         except Exception as e:
             logger.error(f"代理排序失敗: {e}")
@@ -691,7 +698,7 @@ class ProxyQualityAssessor:
             return 50.0, 0.1
         
         # 簡單的趨勢預測
-        recent_scores = history.quality_scores[-5:]  # 最近 5 次評分
+        recent_scores = _tail(history.quality_scores, 5)  # 最近 5 次評分
         
         if len(recent_scores) < 2:
             return recent_scores[0], 0.3
@@ -48,7 +48,7 @@ async def get_database_proxies(
             success=True,
             message=f'成功獲取 {len(result.proxies)} 個代理',
             data={
-                'proxies': [ProxyNodeResponse.from_proxy_node(p).dict() for p in result.proxies],
+                'proxies': [ProxyNodeResponse.from_proxy_node(p).model_dump() for p in result.proxies],
                 'pagination': {
                     'page': result.page,
                     'page_size': result.page_size,
@@ -38,7 +38,7 @@ async def health_check(manager: ProxyManager = Depends(get_proxy_manager)):
     # FastAPI dependency injection 不直接給 request，改用 manager.config or global;簡化: 直接返回 dict
     from fastapi import Response
     from ..api import app as main_app
-    data = response.dict()
+    data = response.model_dump()
     data["version"] = getattr(main_app, 'version', None)
     data["commit"] = getattr(main_app.state, 'commit_hash', None)
     return data
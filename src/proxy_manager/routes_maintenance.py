@@ -9,8 +9,9 @@ from .api_shared import (
     get_proxy_manager,
     require_api_key,
     ProxyResponse,
+    ExportRequest,
+    parse_pool_types,
 )
-from .pools import PoolType
 
 router = APIRouter(dependencies=[Depends(require_api_key)])
 
@@ -31,23 +32,11 @@ async def cleanup_pools(background_tasks: BackgroundTasks, manager=Depends(get_p
         raise HTTPException(status_code=500, detail=f'啟動清理任務失敗: {e}') from e
 
 @router.post('/api/export', summary='導出代理')
-async def export_proxies(export_request: dict, manager=Depends(get_proxy_manager)):
+async def export_proxies(export_request: ExportRequest, manager=Depends(get_proxy_manager)):
     try:
-        pool_types = []
-        req_types = export_request.get('pool_types') if isinstance(export_request, dict) else None
-        if req_types:
-            for name in req_types:
-                n = name.strip().lower()
-                if n == 'hot':
-                    pool_types.append(PoolType.HOT)
-                elif n == 'warm':
-                    pool_types.append(PoolType.WARM)
-                elif n == 'cold':
-                    pool_types.append(PoolType.COLD)
-        if not pool_types:
-            pool_types = [PoolType.HOT, PoolType.WARM, PoolType.COLD]
-        fmt = (export_request.get('format_type') if isinstance(export_request, dict) else 'json') or 'json'
-        filename = export_request.get('filename') if isinstance(export_request, dict) else None
+        pool_types = parse_pool_types(export_request.pool_types)
+        fmt = export_request.format_type
+        filename = export_request.filename
         if not filename:
             filename = f"proxies_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{fmt}"
         file_path = Path('data/exports') / filename
@@ -86,14 +75,12 @@ async def batch_validate(
 ):
     """Execute a batch validation over selected pools returning aggregated stats."""
     try:
-        selected = [p for p in (pool_types.split(',') if pool_types else []) if p in ['hot', 'warm', 'cold']]
-        if not selected:
-            selected = ['hot', 'warm', 'cold']
-        pool_enum_map = { 'hot': PoolType.HOT, 'warm': PoolType.WARM, 'cold': PoolType.COLD }
+        selected_types = parse_pool_types(pool_types.split(',') if pool_types else None)
+        selected = [t.value for t in selected_types]
         # Collect proxies from pools
         proxies = []
-        for name in selected:
-            pool = manager.pool_manager.pools.get(pool_enum_map[name])
+        for pool_type in selected_types:
+            pool = manager.pool_manager.pools.get(pool_type)
             if not pool:
                 continue
             for p in pool.proxies.values():  # include inactive for re-check
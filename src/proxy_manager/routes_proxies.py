@@ -24,8 +24,8 @@ from .api_shared import (
     REQUEST_COUNT,
     REQUEST_LATENCY,
     rate_limit_dependency,
+    parse_pool_types,
 )
-from .pools import PoolType
 from .models import ProxyProtocol, ProxyAnonymity, ProxyFilter
 
 router = APIRouter()
@@ -56,18 +56,7 @@ async def get_proxy(
                 min_score=min_score,
                 max_response_time=max_response_time,
             )
-        pool_types = []
-        if pool_preference:
-            for name in pool_preference.split(','):
-                n = name.strip().lower()
-                if n == 'hot':
-                    pool_types.append(PoolType.HOT)
-                elif n == 'warm':
-                    pool_types.append(PoolType.WARM)
-                elif n == 'cold':
-                    pool_types.append(PoolType.COLD)
-        if not pool_types:
-            pool_types = [PoolType.HOT, PoolType.WARM, PoolType.COLD]
+        pool_types = parse_pool_types(pool_preference.split(',') if pool_preference else None)
         proxy = await manager.get_proxy(filter_criteria, pool_types)
         if not proxy:
             raise HTTPException(status_code=404, detail="沒有找到符合條件的代理")
@@ -110,18 +99,7 @@ async def get_proxies(
                 min_score=min_score,
                 max_response_time=max_response_time,
             )
-        pool_types = []
-        if pool_preference:
-            for name in pool_preference.split(','):
-                n = name.strip().lower()
-                if n == 'hot':
-                    pool_types.append(PoolType.HOT)
-                elif n == 'warm':
-                    pool_types.append(PoolType.WARM)
-                elif n == 'cold':
-                    pool_types.append(PoolType.COLD)
-        if not pool_types:
-            pool_types = [PoolType.HOT, PoolType.WARM, PoolType.COLD]
+        pool_types = parse_pool_types(pool_preference.split(',') if pool_preference else None)
         proxies = await manager.get_proxies(count, filter_criteria, pool_types)
         return [
             ProxyResponse.ok("OK", ProxyNodeResponse.from_proxy_node(p).model_dump())
@@ -142,18 +120,7 @@ async def filter_proxies(
 ):
     try:
         filter_criteria = filter_request.to_proxy_filter()
-        pool_types = []
-        if pool_preference:
-            for name in pool_preference.split(','):
-                n = name.strip().lower()
-                if n == 'hot':
-                    pool_types.append(PoolType.HOT)
-                elif n == 'warm':
-                    pool_types.append(PoolType.WARM)
-                elif n == 'cold':
-                    pool_types.append(PoolType.COLD)
-        if not pool_types:
-            pool_types = [PoolType.HOT, PoolType.WARM, PoolType.COLD]
+        pool_types = parse_pool_types(pool_preference.split(',') if pool_preference else None)
         proxies = await manager.get_proxies(count, filter_criteria, pool_types)
         return [
             ProxyResponse.ok("OK", ProxyNodeResponse.from_proxy_node(p).model_dump())
@@ -30,6 +30,10 @@ from .zmap_integration import ZMapIntegration, IntelligentTargetDiscovery
 
 logger = logging.getLogger(__name__)
 
+# 需走 SOCKS 連接測試的協議
+_SOCKS_PROTOCOLS = frozenset({ProxyProtocol.SOCKS4, ProxyProtocol.SOCKS5})
+_HIGH_QUALITY_GRADES = frozenset({QualityGrade.EXCELLENT, QualityGrade.GOOD})
+
 
 class ProxyScanner:
     """高級代理掃描器
@@ -158,7 +162,7 @@ class ProxyScanner:
         """基本連接測試"""
         try:
             # TCP 連接測試
-            if proxy.protocol in [ProxyProtocol.SOCKS4, ProxyProtocol.SOCKS5]:
+            if proxy.protocol in _SOCKS_PROTOCOLS:
                 return await self._test_socks_connection(proxy)
             else:
                 return await self._test_http_connection(proxy)
@@ -714,7 +718,7 @@ class EnhancedProxyScanner:
                 # 統計高質量代理
                 high_quality_count = len([
                     m for m in quality_metrics 
-                    if m.quality_grade in [QualityGrade.EXCELLENT, QualityGrade.GOOD]
+                    if m.quality_grade in _HIGH_QUALITY_GRADES
                 ])
                 self.enhanced_stats["high_quality_count"] = high_quality_count
             
@@ -70,7 +70,8 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None):
             retention="7 days",
             compression="zip",
             backtrace=True,
-            diagnose=True
+            diagnose=True,
+            enqueue=True  # 經隊列由後台線程寫入文件，不阻塞請求處理
         )
     
     # 設置標準庫日誌級別
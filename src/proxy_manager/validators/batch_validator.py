@@ -8,6 +8,7 @@ import logging
 from typing import List, Optional, TYPE_CHECKING
 
 from .proxy_validator import ProxyValidator, ValidationResult
+from ..crawlers.base_crawler import ProxyNode as CrawlerProxyNode
 from ..models import ProxyNode
 
 if TYPE_CHECKING:
@@ -19,12 +20,14 @@ logger = logging.getLogger(__name__)
 class BatchValidator:
     """批量驗證器（支持大規模驗證）"""
     
-    def __init__(self, config: Optional['ValidationConfig'] = None, batch_size: int = 100):
+    def __init__(self, config: Optional['ValidationConfig'] = None, batch_size: int = 100,
+                 request_interval: float = 1.0):
         """初始化批量驗證器
         
         Args:
             config: 驗證配置
-            batch_size: 批次大小
+            batch_size: 批次大小（同時進行驗證的工作協程數）
+            request_interval: 每個工作協程兩次驗證之間的間隔（秒），用於限制對外部測試端點的請求速率
         """
         # 延遲導入以避免循環依賴
         if config is None:
@@ -33,6 +36,7 @@ class BatchValidator:
         else:
             self.config = config
         self.batch_size = batch_size
+        self.request_interval = request_interval
         self.validator: Optional[ProxyValidator] = None
     
     async def validate_large_batch(self, proxies: List[ProxyNode]) -> List[ValidationResult]:
@@ -46,39 +50,51 @@ class BatchValidator:
         """
         logger.info(f"🔍 開始大批量驗證 {len(proxies)} 個代理，批次大小: {self.batch_size}")
         
-        all_results = []
+        results: List[Optional[ValidationResult]] = [None] * len(proxies)
+        pending = iter(enumerate(proxies))
         
-        async with ProxyValidator(self.config) as validator:
-            self.validator = validator
-            
-            # 分批處理
-            for i in range(0, len(proxies), self.batch_size):
-                batch = proxies[i:i + self.batch_size]
-                logger.info(f"處理批次 {i//self.batch_size + 1}/{(len(proxies)-1)//self.batch_size + 1}")
-                
-                # 並發驗證當前批次
-                tasks = [validator.validate(proxy) for proxy in batch]
-                batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # 處理結果
-                for result in batch_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"驗證過程中發生錯誤: {result}")
-                        continue
-                    all_results.append(result)
-                
-                # 批次間延遲
-                if i + self.batch_size < len(proxies):
-                    await asyncio.sleep(1)
+        validator = ProxyValidator(timeout=self.config.timeout, max_concurrent=self.batch_size)
+        self.validator = validator
+        
+        # batch_size 個工作協程共享同一個待驗證迭代器，任一槽位空出即取下一個，
+        # 不再等待整批最慢的代理；每個協程在兩次驗證之間等待 request_interval 以限制請求速率
+        async def worker():
+            first = True
+            for index, proxy in pending:
+                if not first and self.request_interval > 0:
+                    await asyncio.sleep(self.request_interval)
+                first = False
+                try:
+                    result = await validator.validate_proxy(self._to_validator_node(proxy), test_geo=False)
+                except Exception as e:
+                    logger.error(f"驗證過程中發生錯誤: {e}")
+                    continue
+                # 結果回填原始的代理節點，供代理池直接使用
+                result.proxy = proxy
+                results[index] = result
         
+        worker_count = min(self.batch_size, len(proxies))
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
+        
+        all_results = [result for result in results if result is not None]
         logger.info(f"✅ 大批量驗證完成，共處理 {len(all_results)} 個結果")
         return all_results
     
+    @staticmethod
+    def _to_validator_node(proxy: ProxyNode) -> CrawlerProxyNode:
+        """將代理池節點轉換為驗證器使用的節點格式"""
+        return CrawlerProxyNode(
+            ip=proxy.host,
+            port=proxy.port,
+            protocol=proxy.protocol.value.upper(),
+            source=proxy.source or "Unknown",
+        )
+    
     async def __aenter__(self):
         """異步上下文管理器入口"""
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """異步上下文管理器出口"""
-        if self.validator:
-            await self.validator.__aexit__(exc_type, exc_val, exc_tb)
\ No newline at end of file
+        # 驗證器每次探測自行建立並關閉連線，此處只需釋放引用
+        self.validator = None
\ No newline at end of file
@@ -67,6 +67,11 @@ class ValidationResult:
         if self.test_timestamp is None:
             self.test_timestamp = time.time()
     
+    @property
+    def is_working(self) -> bool:
+        """代理是否通過連通性測試"""
+        return self.status == ProxyStatus.WORKING
+    
     def to_dict(self) -> Dict[str, Any]:
         """轉換為字典格式"""
         result = asdict(self)
@@ -16,7 +16,9 @@ import asyncio
 import multiprocessing
 import signal
 import sys
+import threading
 import time
+from multiprocessing.connection import wait as wait_for_sentinels
 from pathlib import Path
 from typing import List, Optional
 
@@ -29,7 +31,9 @@ sys.path.insert(0, str(project_root))
 
 # 導入配置加載器
 try:
-    from src.config.config_loader import get_config, AppConfig
+    from src.config.config_loader import (
+        get_config, prewarm_shared_memory, release_shared_memory, AppConfig
+    )
     CONFIG_AVAILABLE = True
 except ImportError as e:
     logger.warning(f"⚠️ 無法導入配置加載器: {e}")
@@ -48,12 +52,15 @@ class ServerManager:
         self.processes: List[multiprocessing.Process] = []
         self.running = False
         self.config: Optional[AppConfig] = None
+        self._shared_config = None
         
         # 加載配置
         if CONFIG_AVAILABLE:
             try:
                 self.config = get_config()
                 logger.info("✅ 配置加載成功")
+                # 預熱共享記憶體，服務子進程直接讀取已解析配置
+                self._shared_config = prewarm_shared_memory(self.config)
             except Exception as e:
                 logger.error(f"❌ 配置加載失敗: {e}")
                 self.config = None
@@ -87,7 +94,8 @@ class ServerManager:
                     level="DEBUG",
                     rotation=log_config.file.rotation,
                     retention=log_config.file.retention,
-                    compression=log_config.file.compression
+                    compression=log_config.file.compression,
+                    enqueue=True  # 文件寫入交由後台線程處理
                 )
         else:
             # 默認日誌配置
@@ -101,7 +109,8 @@ class ServerManager:
                 format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
                 level="DEBUG",
                 rotation="1 day",
-                retention="7 days"
+                retention="7 days",
+                enqueue=True
             )
     
     def start_main_api_server(self, host: str = "0.0.0.0", port: int = 8000):
@@ -141,10 +150,8 @@ class ServerManager:
         try:
             logger.info(f"🚀 啟動監控儀表板服務器 - {host}:{port}")
             # 這裡可以啟動監控儀表板的 Web 服務器
-            # 目前先用一個簡單的佔位符
-            import time
-            while True:
-                time.sleep(1)
+            # 目前先用一個簡單的佔位符：阻塞等待直到進程被終止，不做週期性喚醒
+            threading.Event().wait()
         except Exception as e:
             logger.error(f"❌ 監控儀表板服務器啟動失敗: {e}")
             raise
@@ -330,16 +337,19 @@ class ServerManager:
     def monitor_processes(self):
         """監控進程狀態"""
         try:
-            while self.running:
-                time.sleep(5)
-                
-                # 檢查進程狀態
-                for process in self.processes:
-                    if not process.is_alive():
-                        logger.warning(f"⚠️ 進程 {process.name} (PID: {process.pid}) 已停止")
-                        
-                        # 可以在這裡添加自動重啟邏輯
-                        # self.restart_process(process)
+            # 阻塞等待子進程的 sentinel，進程退出時立即喚醒，無需每隔幾秒輪詢
+            watching = {process.sentinel: process for process in self.processes if process.is_alive()}
+            while self.running and watching:
+                for sentinel in wait_for_sentinels(list(watching)):
+                    process = watching.pop(sentinel)
+                    logger.warning(f"⚠️ 進程 {process.name} (PID: {process.pid}) 已停止")
+                    
+                    # 可以在這裡添加自動重啟邏輯
+                    # self.restart_process(process)
+            
+            if self.running:
+                logger.error("❌ 所有服務進程均已停止")
+                self.stop_all_servers()
                 
         except KeyboardInterrupt:
             logger.info("🛑 收到停止信號，正在關閉所有服務...")
@@ -366,6 +376,12 @@ class ServerManager:
                         process.join()
             
             self.processes.clear()
+            
+            # 釋放共享記憶體配置
+            if CONFIG_AVAILABLE:
+                release_shared_memory(self._shared_config)
+                self._shared_config = None
+            
             logger.info("✅ 所有服務器已停止")
             
         except Exception as e:
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from src.proxy_manager.models import ProxyNode
+from src.proxy_manager.validators.batch_validator import BatchValidator
+from src.proxy_manager.validators.proxy_validator import AnonymityLevel, ProxyStatus, ProxyValidator
+
+
+class _StubProbe:
+    """以假探測取代 ProxyValidator 的網路測試，並記錄同時進行的驗證數"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def connectivity(self, proxy_url, test_url):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        port = int(proxy_url.rsplit(':', 1)[1])
+        await asyncio.sleep(0.001 * (port % 3))
+        self.in_flight -= 1
+        if port == 8003:
+            return {'status': ProxyStatus.FAILED, 'error': 'refused'}
+        return {'status': ProxyStatus.WORKING, 'response_time': 0.1}
+
+    async def https_support(self, proxy_url):
+        return False
+
+    async def anonymity(self, proxy_url):
+        return AnonymityLevel.ELITE
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    stub = _StubProbe()
+    monkeypatch.setattr(ProxyValidator, '_test_connectivity', stub.connectivity)
+    monkeypatch.setattr(ProxyValidator, '_test_https_support', stub.https_support)
+    monkeypatch.setattr(ProxyValidator, '_test_anonymity', stub.anonymity)
+    return stub
+
+
+@pytest.mark.asyncio
+async def test_large_batch_keeps_order_and_bounds_concurrency(probe):
+    proxies = [ProxyNode(host='10.0.0.1', port=8000 + i) for i in range(10)]
+
+    results = await BatchValidator(batch_size=3, request_interval=0).validate_large_batch(proxies)
+
+    assert [result.proxy for result in results] == proxies
+    assert [result.status for result in results] == [
+        ProxyStatus.FAILED if i == 3 else ProxyStatus.WORKING for i in range(10)
+    ]
+    assert probe.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_large_batch_spaces_requests_per_worker(probe):
+    proxies = [ProxyNode(host='10.0.0.1', port=8000 + i) for i in range(4)]
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    await BatchValidator(batch_size=2, request_interval=0.05).validate_large_batch(proxies)
+
+    assert loop.time() - started >= 0.05
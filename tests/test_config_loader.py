@@ -0,0 +1,124 @@
+import os
+from multiprocessing.shared_memory import SharedMemory
+
+import yaml
+
+import src.config.config_loader as config_loader_module
+from src.config.config_loader import ConfigLoader, _DEFAULT_CONFIG_DICT, _deep_merge
+
+
+def test_deep_merge_keeps_base_untouched():
+    overlay = {'database': {'redis': {'host': 'cache'}}, 'feature_flags': {'geo_filtering': False}}
+    merged = _deep_merge(_DEFAULT_CONFIG_DICT, overlay)
+
+    assert merged['database']['redis']['host'] == 'cache'
+    assert merged['database']['redis']['port'] == 6379
+    assert merged['feature_flags']['geo_filtering'] is False
+    assert merged['feature_flags']['etl_pipeline'] is True
+    assert _DEFAULT_CONFIG_DICT['database']['redis']['host'] == 'localhost'
+
+
+def test_partial_yaml_falls_back_to_defaults(tmp_path):
+    config_file = tmp_path / 'server_config.yaml'
+    config_file.write_text(yaml.safe_dump({'main_api': {'port': 9000}}), encoding='utf-8')
+
+    config = ConfigLoader(config_file).load_config()
+
+    assert config.main_api.port == 9000
+    assert config.etl_api.port == 8001
+    assert config.monitoring_config.metrics.collection_interval == 60
+
+
+def test_missing_file_uses_defaults(tmp_path):
+    config = ConfigLoader(tmp_path / 'missing.yaml').load_config()
+
+    assert config.main_api.port == 8000
+    assert config.database.postgresql.database == 'proxy_manager'
+
+
+def test_shared_memory_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_loader_module, 'SHARED_CONFIG_PREFIX', 'proxy_cfg_test')
+    monkeypatch.setenv(config_loader_module.SHARED_CONFIG_ENV, 'unset')
+    config_file = tmp_path / 'server_config.yaml'
+    config_file.write_text(yaml.safe_dump({'main_api': {'port': 9100}}), encoding='utf-8')
+
+    shm = ConfigLoader(config_file).prewarm_shared_memory()
+    try:
+        assert os.environ[config_loader_module.SHARED_CONFIG_ENV] == f'proxy_cfg_test_{os.getpid()}'
+        config = config_loader_module._load_from_shared_memory()
+        # 指定路徑的加載器只讀取該文件，不受共享記憶體影響
+        explicit = ConfigLoader(tmp_path / 'missing.yaml').load_config()
+    finally:
+        ConfigLoader.release_shared_memory(shm)
+
+    assert config.main_api.port == 9100
+    assert config.monitoring.port == 8002
+    assert config.monitoring_config.alerts.enabled is True
+    assert explicit.main_api.port == 8000
+    assert config_loader_module.SHARED_CONFIG_ENV not in os.environ
+    assert config_loader_module._load_from_shared_memory() is None
+
+
+def test_prewarm_replaces_stale_block(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_loader_module, 'SHARED_CONFIG_PREFIX', 'proxy_cfg_stale')
+    monkeypatch.setenv(config_loader_module.SHARED_CONFIG_ENV, 'unset')
+    stale = SharedMemory(name=f'proxy_cfg_stale_{os.getpid()}', create=True, size=8)
+    stale.close()
+    config_file = tmp_path / 'server_config.yaml'
+    config_file.write_text(yaml.safe_dump({'main_api': {'port': 9200}}), encoding='utf-8')
+
+    shm = ConfigLoader(config_file).prewarm_shared_memory()
+    try:
+        config = config_loader_module._load_from_shared_memory()
+    finally:
+        ConfigLoader.release_shared_memory(shm)
+
+    assert config.main_api.port == 9200
+
+
+def test_env_overrides_convert_types(tmp_path, monkeypatch):
+    monkeypatch.setenv('REDIS_PORT', '6380')
+    monkeypatch.setenv('MAIN_API_PORT', '8080')
+    monkeypatch.setenv('SERVER_DEBUG', 'off')
+
+    config = ConfigLoader(tmp_path / 'missing.yaml').load_config()
+
+    assert config.database.redis.port == 6380
+    assert config.main_api.port == 8080
+    assert config.server.debug is False
+
+
+def test_env_bool_accepts_only_original_truthy_values(tmp_path, monkeypatch):
+    for value, expected in (('YES', True), ('1', True), ('on', False), ('y', False), ('t', False)):
+        monkeypatch.setenv('SERVER_DEBUG', value)
+        assert ConfigLoader(tmp_path / 'missing.yaml').load_config().server.debug is expected
+
+
+def test_reload_config_clears_cache(monkeypatch):
+    monkeypatch.setattr(config_loader_module, '_load_from_shared_memory', lambda: None)
+    config_loader_module.reload_config()
+    first = config_loader_module.get_config()
+    assert config_loader_module.get_config() is first
+
+    monkeypatch.setenv('MAIN_API_PORT', '8088')
+    reloaded = config_loader_module.reload_config()
+
+    assert reloaded is not first
+    assert reloaded.main_api.port == 8088
+    assert config_loader_module.get_config() is reloaded
+
+
+def test_yaml_parse_cached_until_file_changes(tmp_path):
+    config_file = tmp_path / 'server_config.yaml'
+    config_file.write_text(yaml.safe_dump({'main_api': {'port': 9000}}), encoding='utf-8')
+
+    first = config_loader_module._read_yaml(config_file)
+    assert config_loader_module._read_yaml(config_file) is first
+    ConfigLoader(config_file).load_config()
+    assert first == {'main_api': {'port': 9000}}
+
+    config_file.write_text(yaml.safe_dump({'main_api': {'port': 9001}}), encoding='utf-8')
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert ConfigLoader(config_file).load_config().main_api.port == 9001
@@ -0,0 +1,46 @@
+import pytest
+
+from src.html_to_markdown.core import ConversionConfig, ConversionResult, HTMLToMarkdownConverter
+
+
+class _CountingConverter(HTMLToMarkdownConverter):
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    async def convert(self, html_content, url=""):
+        self.calls += 1
+        return ConversionResult(success=True, content=html_content.upper(), original_length=len(html_content),
+                                converted_length=len(html_content), processing_time=0.0,
+                                engine_used=self.config.engine, url=url)
+
+    def validate_html(self, html_content):
+        return True
+
+
+@pytest.mark.asyncio
+async def test_convert_with_retry_reuses_result_for_same_content():
+    converter = _CountingConverter(ConversionConfig())
+
+    first = await converter.convert_with_retry('<p>a</p>', 'http://example.com')
+    again = await converter.convert_with_retry('<p>a</p>', 'http://example.com')
+    other = await converter.convert_with_retry('<p>b</p>', 'http://example.com')
+
+    assert again is first
+    assert other.content == '<P>B</P>'
+    assert converter.calls == 2
+    assert await converter.get_cached_result('<p>a</p>', 'http://example.com') is first
+
+    converter.config.include_images = False
+    assert await converter.get_cached_result('<p>a</p>', 'http://example.com') is None
+
+
+@pytest.mark.asyncio
+async def test_caching_disabled_always_converts():
+    converter = _CountingConverter(ConversionConfig(enable_caching=False))
+
+    for _ in range(2):
+        await converter.convert_with_retry('<p>a</p>')
+
+    assert converter.calls == 2
+    assert converter._cache == {}
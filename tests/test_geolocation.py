@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from src.proxy_manager.geolocation_enhanced import EnhancedGeolocationDetector, GeolocationInfo, IntelligentProxyRouter
+from src.proxy_manager.models import ProxyFilter, ProxyNode, ProxyStatus
+from src.proxy_manager.pools import PoolType, ProxyPoolManager
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_for_same_ip_share_one_detection():
+    detector = EnhancedGeolocationDetector.__new__(EnhancedGeolocationDetector)
+    detector._inflight = {}
+    calls = []
+
+    async def fake_detect(ip, use_cache):
+        calls.append(ip)
+        await asyncio.sleep(0.01)
+        return GeolocationInfo(ip=ip, country='Taiwan', country_code='TW', confidence=0.9)
+
+    detector._detect_location = fake_detect
+
+    results = await asyncio.gather(*(detector.detect_location('1.2.3.4') for _ in range(5)),
+                                   detector.detect_location('5.6.7.8'))
+
+    assert calls == ['1.2.3.4', '5.6.7.8']
+    assert all(result is results[0] for result in results[:5])
+    assert detector._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_router_picks_highest_score_first_on_ties():
+    router = IntelligentProxyRouter(geolocation_detector=None)
+    proxies = [ProxyNode(host=f'10.0.0.{i}', port=8080) for i in range(4)]
+    scores = {'10.0.0.0': 0.2, '10.0.0.1': 0.9, '10.0.0.2': 0.9, '10.0.0.3': 0.5}
+
+    async def no_target(target_url):
+        return None
+
+    async def score(proxy, target_location, preferences):
+        return scores[proxy.host]
+
+    router._get_target_location = no_target
+    router._calculate_proxy_score = score
+
+    best = await router.select_optimal_proxy(proxies, 'http://example.com')
+
+    assert best is proxies[1]
+    assert router.routing_history[-1]['score'] == 0.9
+
+
+@pytest.mark.asyncio
+async def test_location_tags_are_reindexed_in_the_pool():
+    detector = EnhancedGeolocationDetector.__new__(EnhancedGeolocationDetector)
+
+    async def fake_detect(ip):
+        return GeolocationInfo(ip=ip, country='United States', country_code='US', confidence=0.9)
+
+    detector.detect_location = fake_detect
+    manager = ProxyPoolManager()
+    proxy = ProxyNode(host='10.0.0.1', port=8080, status=ProxyStatus.ACTIVE)
+    await manager.pools[PoolType.WARM].add_proxy(proxy)
+
+    await detector.enhance_proxy_with_location(proxy, manager)
+
+    assert proxy.tags == ['country:us']
+    assert await manager.get_proxy([PoolType.WARM], ProxyFilter(tags=['country:us'])) is proxy
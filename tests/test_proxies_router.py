@@ -8,3 +8,73 @@ def test_get_proxy_response_structure():
     if r.status_code == 200:
         data = r.json()
         assert 'success' in data and 'data' in data
+
+
+def test_parse_pool_types_lookup():
+    from src.proxy_manager.api_shared import parse_pool_types
+    from src.proxy_manager.pools import PoolType
+
+    assert parse_pool_types(['Hot', ' cold ', 'bogus']) == [PoolType.HOT, PoolType.COLD]
+    assert parse_pool_types(None) == [PoolType.HOT, PoolType.WARM, PoolType.COLD]
+    assert parse_pool_types(['blacklist']) == [PoolType.HOT, PoolType.WARM, PoolType.COLD]
+
+
+def test_filter_request_skips_unknown_enum_values():
+    from src.proxy_manager.api_shared import ProxyFilterRequest
+    from src.proxy_manager.models import ProxyAnonymity, ProxyProtocol
+
+    criteria = ProxyFilterRequest(protocols=['http', 'gopher'], anonymity_levels=['elite', 'bogus']).filter
+
+    assert criteria.protocols == [ProxyProtocol.HTTP]
+    assert criteria.anonymity_levels == [ProxyAnonymity.ELITE]
+
+
+def test_proxy_node_response_matches_validated_model():
+    from src.proxy_manager.api_shared import ProxyNodeResponse
+    from src.proxy_manager.models import ProxyNode, ProxyStatus
+
+    proxy = ProxyNode(host='10.0.0.1', port=8080, country='TW', status=ProxyStatus.ACTIVE)
+    proxy.metrics.response_time_ms = 420
+
+    built = ProxyNodeResponse.from_proxy_node(proxy).model_dump()
+
+    assert built == ProxyNodeResponse.model_validate(built).model_dump()
+    assert built['protocol'] == 'http' and built['response_time_ms'] == 420
+
+
+def test_export_request_accepts_only_known_formats():
+    import pytest
+    from pydantic import ValidationError
+    from src.proxy_manager.api_shared import ExportRequest
+
+    assert ExportRequest().format_type == 'json'
+    assert ExportRequest(format_type='ndjson.gz').format_type == 'ndjson.gz'
+    with pytest.raises(ValidationError):
+        ExportRequest(format_type='ndjsonXgz')
+
+
+def test_export_rejects_unknown_format(tmp_path, monkeypatch):
+    from fastapi import FastAPI
+    from src.proxy_manager import routes_maintenance
+    from src.proxy_manager.api_shared import get_proxy_manager
+
+    exported = []
+
+    class _Manager:
+        async def export_proxies(self, file_path, fmt, pool_types):
+            exported.append(fmt)
+            return 0
+
+    monkeypatch.chdir(tmp_path)
+    proxy_app = FastAPI()
+    proxy_app.include_router(routes_maintenance.router)
+    proxy_app.dependency_overrides[get_proxy_manager] = lambda: _Manager()
+    client = TestClient(proxy_app)
+
+    bad = client.post('/api/export', json={'format_type': 'xml'})
+    good = client.post('/api/export', json={'format_type': 'ndjson', 'filename': 'out.ndjson'})
+
+    assert bad.status_code == 422
+    assert good.status_code == 200
+    assert good.json()['format'] == 'ndjson'
+    assert exported == ['ndjson']
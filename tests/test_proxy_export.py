@@ -0,0 +1,83 @@
+import asyncio
+import gzip
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.proxy_manager.manager import ProxyManager
+from src.proxy_manager.models import ProxyNode, ProxyStatus
+from src.proxy_manager.pools import PoolType
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_streams_active_proxies(tmp_path):
+    active = [ProxyNode(host=f'10.0.0.{i}', port=8080, status=ProxyStatus.ACTIVE) for i in range(3)]
+    inactive = ProxyNode(host='10.0.0.99', port=8080)
+    manager = ProxyManager.__new__(ProxyManager)
+    manager.pool_manager = SimpleNamespace(pools={
+        PoolType.HOT: SimpleNamespace(proxies={p.proxy_id: p for p in active[:2]}),
+        PoolType.WARM: SimpleNamespace(proxies={p.proxy_id: p for p in (active[2], inactive)}),
+    })
+    out = tmp_path / 'proxies.ndjson'
+
+    count = await manager._export_proxies_ndjson(out, [PoolType.HOT, PoolType.WARM, PoolType.COLD], batch_size=2)
+
+    lines = out.read_text(encoding='utf-8').splitlines()
+    assert count == 3
+    assert [json.loads(line)['host'] for line in lines] == ['10.0.0.0', '10.0.0.1', '10.0.0.2']
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_gz_streams_compressed_batches(tmp_path):
+    active = [ProxyNode(host=f'10.0.0.{i}', port=8080, status=ProxyStatus.ACTIVE) for i in range(5)]
+    manager = ProxyManager.__new__(ProxyManager)
+    manager.pool_manager = SimpleNamespace(pools={PoolType.HOT: SimpleNamespace(proxies={p.proxy_id: p for p in active})})
+    out = tmp_path / 'proxies.ndjson.gz'
+
+    count = await manager.export_proxies(out, 'ndjson.gz', [PoolType.HOT])
+
+    lines = gzip.decompress(out.read_bytes()).decode('utf-8').splitlines()
+    assert count == 5
+    assert [json.loads(line)['host'] for line in lines] == [p.host for p in active]
+
+
+@pytest.mark.asyncio
+async def test_export_survives_pool_mutation_while_streaming(tmp_path):
+    active = [ProxyNode(host=f'10.0.0.{i}', port=8080, status=ProxyStatus.ACTIVE) for i in range(6)]
+    pool = {p.proxy_id: p for p in active}
+    manager = ProxyManager.__new__(ProxyManager)
+    manager.pool_manager = SimpleNamespace(pools={PoolType.HOT: SimpleNamespace(proxies=pool)})
+    out = tmp_path / 'proxies.ndjson.gz'
+
+    export = asyncio.create_task(manager._export_proxies_ndjson(out, [PoolType.HOT], batch_size=1, compress=True))
+    mutations = 0
+    await asyncio.sleep(0)
+    while not export.done():
+        # 寫檔讓出控制權期間持續增刪池內代理
+        extra = ProxyNode(host=f'10.0.1.{mutations}', port=8080, status=ProxyStatus.ACTIVE)
+        pool[extra.proxy_id] = extra
+        pool.pop(active[mutations % len(active)].proxy_id, None)
+        mutations += 1
+        await asyncio.sleep(0)
+    count = await export
+
+    lines = gzip.decompress(out.read_bytes()).decode('utf-8').splitlines()
+    assert mutations > 1
+    assert count == 6
+    assert [json.loads(line)['host'] for line in lines] == [p.host for p in active]
+
+
+@pytest.mark.asyncio
+async def test_export_dispatches_by_format(tmp_path):
+    active = [ProxyNode(host=f'10.0.0.{i}', port=8080, status=ProxyStatus.ACTIVE) for i in range(2)]
+    manager = ProxyManager.__new__(ProxyManager)
+    manager.pool_manager = SimpleNamespace(pools={PoolType.HOT: SimpleNamespace(proxies={p.proxy_id: p for p in active})})
+
+    assert await manager.export_proxies(tmp_path / 'out.txt', 'TXT', [PoolType.HOT]) == 2
+    assert await manager.export_proxies(tmp_path / 'out.json', 'json', [PoolType.HOT]) == 2
+    with pytest.raises(ValueError):
+        await manager.export_proxies(tmp_path / 'out.xml', 'xml', [PoolType.HOT])
+
+    assert (tmp_path / 'out.txt').read_text(encoding='utf-8') == '10.0.0.0:8080\n10.0.0.1:8080'
+    assert json.loads((tmp_path / 'out.json').read_text(encoding='utf-8'))['total_count'] == 2
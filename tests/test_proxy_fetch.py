@@ -0,0 +1,118 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.proxy_manager.fetchers import ProxyFetcher
+from src.proxy_manager.manager import ProxyManager
+from src.proxy_manager.models import ProxyNode
+from src.proxy_manager.validators import AnonymityLevel, BatchValidator, ProxyStatus, ProxyValidator
+
+
+class _Fetcher(ProxyFetcher):
+    def __init__(self, name, proxies=None, error=None, barrier=None):
+        super().__init__(name)
+        self.proxies = proxies or []
+        self.error = error
+        self.barrier = barrier
+
+    async def fetch_proxies(self, limit=None):
+        if self.barrier is not None:
+            # 所有被選中的來源都進入後才會放行；依序獲取時會在此超時
+            await asyncio.wait_for(self.barrier.wait(), timeout=1)
+        if self.error:
+            raise self.error
+        return self.proxies
+
+
+def _bare_manager(added, batch_validator=None):
+    async def add_proxies(proxies):
+        added.extend(proxies)
+
+    manager = ProxyManager.__new__(ProxyManager)
+    manager._fetch_lock = asyncio.Lock()
+    manager.fetch_service = None
+    manager.validation_service = None
+    manager.batch_validator = batch_validator
+    manager.stats = {'total_fetched': 0, 'total_validated': 0}
+    manager.pool_manager = SimpleNamespace(add_proxies=add_proxies)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_fetch_proxies_queries_sources_concurrently():
+    added = []
+    manager = _bare_manager(added)
+    barrier = asyncio.Barrier(3)
+    failing = _Fetcher('b', error=RuntimeError('down'), barrier=barrier)
+    manager.fetcher_manager = SimpleNamespace(fetchers=[
+        _Fetcher('a', [ProxyNode(host='10.0.0.1', port=8080)], barrier=barrier),
+        failing,
+        _Fetcher('c', [ProxyNode(host='10.0.0.3', port=8080)], barrier=barrier),
+        _Fetcher('d', [ProxyNode(host='10.0.0.4', port=8080)]),
+    ])
+
+    proxies = await manager.fetch_proxies(sources=['a', 'b', 'c'])
+
+    assert [p.host for p in proxies] == ['10.0.0.1', '10.0.0.3']
+    assert added == proxies
+    assert failing.fetch_errors == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_proxies_keeps_only_proxies_passing_batch_validation(monkeypatch):
+    async def connectivity(self, proxy_url, test_url):
+        if proxy_url.startswith('http://10.0.0.2:'):
+            return {'status': ProxyStatus.FAILED, 'error': 'refused'}
+        return {'status': ProxyStatus.WORKING, 'response_time': 0.1}
+
+    async def https_support(self, proxy_url):
+        return False
+
+    async def anonymity(self, proxy_url):
+        return AnonymityLevel.ANONYMOUS
+
+    monkeypatch.setattr(ProxyValidator, '_test_connectivity', connectivity)
+    monkeypatch.setattr(ProxyValidator, '_test_https_support', https_support)
+    monkeypatch.setattr(ProxyValidator, '_test_anonymity', anonymity)
+    added = []
+    manager = _bare_manager(added, BatchValidator(batch_size=2, request_interval=0))
+    fetched = [ProxyNode(host=f'10.0.0.{i}', port=8080) for i in range(1, 4)]
+    manager.fetcher_manager = SimpleNamespace(fetchers=[_Fetcher('a', fetched)])
+
+    proxies = await manager.fetch_proxies()
+
+    assert proxies == [fetched[0], fetched[2]]
+    assert added == proxies
+    assert manager.stats['total_fetched'] == 3
+
+
+@pytest.mark.asyncio
+async def test_tracked_tasks_release_themselves_when_done():
+    manager = ProxyManager.__new__(ProxyManager)
+    manager._tasks = set()
+
+    task = asyncio.create_task(asyncio.sleep(0))
+    manager._track_task(task)
+    assert manager._tasks == {task}
+
+    await task
+    await asyncio.sleep(0)
+    assert manager._tasks == set()
+
+
+@pytest.mark.asyncio
+async def test_task_status_keeps_end_time_stable():
+    manager = ProxyManager.__new__(ProxyManager)
+    manager._heartbeat = {}
+    manager._task_registry = {}
+
+    task = asyncio.create_task(asyncio.sleep(0))
+    manager._register_task('sync', task)
+    await task
+    first, second = manager.get_task_status(), manager.get_task_status()
+
+    entry = first['tasks']['sync']
+    assert 'task' not in entry
+    assert entry['done'] is True and entry['cancelled'] is False
+    assert second['tasks']['sync']['ended_at'] == entry['ended_at']
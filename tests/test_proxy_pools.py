@@ -0,0 +1,169 @@
+import pytest
+
+from src.proxy_manager.models import ProxyFilter, ProxyNode, ProxyStatus
+from src.proxy_manager.pools import PoolConfig, PoolType, ProxyPool
+
+
+@pytest.mark.asyncio
+async def test_tag_index_tracks_pool_membership():
+    pool = ProxyPool(PoolType.WARM, PoolConfig())
+    github = ProxyNode(host='10.0.0.1', port=8080, status=ProxyStatus.ACTIVE, tags=['github', 'http'])
+    shodan = ProxyNode(host='10.0.0.2', port=8080, status=ProxyStatus.ACTIVE, tags=['shodan'])
+    await pool.add_proxy(github)
+    await pool.add_proxy(shodan)
+
+    assert await pool.get_proxy(ProxyFilter(tags=['shodan'])) is shodan
+    assert await pool.get_proxy(ProxyFilter(tags=['missing'])) is None
+
+    await pool.remove_proxy(shodan.proxy_id)
+    assert await pool.get_proxy(ProxyFilter(tags=['shodan'])) is None
+    assert 'shodan' not in pool._tag_index
+    assert pool._tag_index['github'] == {github.proxy_id}
+
+
+@pytest.mark.asyncio
+async def test_reindexed_tags_reach_the_fastest_hot_proxy():
+    pool = ProxyPool(PoolType.HOT, PoolConfig())
+    slow = ProxyNode(host='10.0.0.1', port=8080, status=ProxyStatus.ACTIVE, tags=['country:us'])
+    slow.metrics.update_success(900)
+    fast = ProxyNode(host='10.0.0.2', port=8080, status=ProxyStatus.ACTIVE)
+    fast.metrics.update_success(50)
+    await pool.add_proxy(slow)
+    await pool.add_proxy(fast)
+
+    # 與地理位置增強相同，就地追加標籤後經 reindex_tags 更新索引
+    fast.tags.append('country:us')
+    await pool.reindex_tags(fast.proxy_id)
+
+    assert await pool.get_proxy(ProxyFilter(tags=['country:us'])) is fast
+    assert pool._tag_index['country:us'] == {slow.proxy_id, fast.proxy_id}
+
+    fast.tags.remove('country:us')
+    await pool.remove_proxy(fast.proxy_id)
+    assert pool._tag_index['country:us'] == {slow.proxy_id}
+
+
+@pytest.mark.asyncio
+async def test_usage_queue_skips_removed_entries_when_evicting():
+    pool = ProxyPool(PoolType.WARM, PoolConfig(warm_pool_max_size=2))
+    first, second, third = (ProxyNode(host=f'10.0.0.{i}', port=8080) for i in range(3))
+    await pool.add_proxy(first)
+    await pool.add_proxy(second)
+    await pool.remove_proxy(first.proxy_id)
+    await pool.add_proxy(first)
+
+    await pool.add_proxy(third)
+
+    assert set(pool.proxies) == {first.proxy_id, third.proxy_id}
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_rotates_to_least_recently_used():
+    pool = ProxyPool(PoolType.WARM, PoolConfig())
+    proxies = [ProxyNode(host=f'10.0.0.{i}', port=8080, status=ProxyStatus.ACTIVE) for i in range(3)]
+    for proxy in proxies:
+        await pool.add_proxy(proxy)
+
+    picked = [await pool.get_proxy() for _ in range(4)]
+
+    assert picked == [proxies[0], proxies[1], proxies[2], proxies[0]]
+
+
+def test_compiled_filter_agrees_with_matches():
+    from src.proxy_manager.models import ProxyAnonymity, ProxyProtocol
+
+    proxies = [
+        ProxyNode(host='10.0.0.1', port=8080, protocol=ProxyProtocol.HTTP, country='US', tags=['github']),
+        ProxyNode(host='10.0.0.2', port=1080, protocol=ProxyProtocol.SOCKS5, anonymity=ProxyAnonymity.ELITE,
+                  country='TW', status=ProxyStatus.ACTIVE),
+        ProxyNode(host='10.0.0.3', port=3128, protocol=ProxyProtocol.HTTPS, country='TW', tags=['shodan']),
+    ]
+    filters = [
+        ProxyFilter(),
+        ProxyFilter(countries=['TW']),
+        ProxyFilter(protocols=[ProxyProtocol.SOCKS5, ProxyProtocol.HTTPS], countries=['TW'], tags=['shodan']),
+        ProxyFilter(anonymity_levels=[ProxyAnonymity.ELITE], status=[ProxyStatus.ACTIVE], max_response_time=500),
+        ProxyFilter(min_score=0.5, min_success_rate=0.0),
+    ]
+
+    for criteria in filters:
+        predicate = criteria.compile()
+        assert [predicate(p) for p in proxies] == [criteria.matches(p) for p in proxies]
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_single_pass_over_active_proxies():
+    pool = ProxyPool(PoolType.WARM, PoolConfig())
+    fast = ProxyNode(host='10.0.0.1', port=8080, country='TW', status=ProxyStatus.ACTIVE)
+    fast.metrics.update_success(200)
+    slow = ProxyNode(host='10.0.0.2', port=8080, country='TW', status=ProxyStatus.ACTIVE)
+    slow.metrics.update_success(400)
+    slow.metrics.update_failure()
+    await pool.add_proxy(fast)
+    await pool.add_proxy(slow)
+    await pool.add_proxy(ProxyNode(host='10.0.0.3', port=8080, country='US'))
+
+    stats = pool.get_stats()
+
+    assert (stats.total_count, stats.active_count) == (3, 2)
+    assert stats.average_response_time == 300
+    assert stats.success_rate == 2 / 3
+    assert stats.country_distribution == {'TW': 2}
+
+
+@pytest.mark.asyncio
+async def test_pool_manager_leases_expire_on_monotonic_deadline():
+    from src.proxy_manager.pools import ProxyPoolManager
+
+    clock = {'now': 1000.0}
+    manager = ProxyPoolManager(clock=lambda: clock['now'])
+    proxy = ProxyNode(host='10.0.0.1', port=8080, status=ProxyStatus.ACTIVE)
+    await manager.pools[PoolType.WARM].add_proxy(proxy)
+
+    assert await manager.get_proxy([PoolType.WARM]) is proxy
+    assert await manager.get_proxy([PoolType.WARM]) is None
+
+    clock['now'] += manager._default_lease_seconds + 1
+    assert await manager.get_proxy([PoolType.WARM]) is proxy
+
+
+@pytest.mark.asyncio
+async def test_returned_lease_leaves_no_stale_expiry():
+    from src.proxy_manager.pools import ProxyPoolManager
+
+    clock = {'now': 1000.0}
+    manager = ProxyPoolManager(clock=lambda: clock['now'])
+    proxy = ProxyNode(host='10.0.0.1', port=8080, status=ProxyStatus.ACTIVE)
+    await manager.pools[PoolType.WARM].add_proxy(proxy)
+
+    assert await manager.get_proxy([PoolType.WARM]) is proxy
+    await manager.return_proxy(proxy)
+
+    clock['now'] += 10
+    assert await manager.get_proxy([PoolType.WARM]) is proxy
+
+    # 第一次租借的舊到期時間不應提前釋放第二次租借
+    clock['now'] += manager._default_lease_seconds - 5
+    assert await manager.get_proxy([PoolType.WARM]) is None
+    assert len(manager._lease_heap) == 1
+
+    clock['now'] += 10
+    assert await manager.get_proxy([PoolType.WARM]) is proxy
+
+
+def test_proxy_node_interns_low_cardinality_fields():
+    country = ''.join(['T', 'W'])
+    first = ProxyNode(host='10.0.0.1', port=8080, country=country, tags=[''.join(['h', 'ot'])])
+    second = ProxyNode.from_dict({'host': '10.0.0.2', 'port': 8080, 'country': ''.join(['T', 'W']), 'tags': ['hot']})
+
+    assert first.country is second.country
+    assert first.tags[0] is second.tags[0]
+
+
+def test_proxy_node_uses_slots():
+    proxy = ProxyNode(host='10.0.0.1', port=8080)
+
+    assert not hasattr(proxy, '__dict__')
+    assert proxy.proxy_id == '10.0.0.1:8080'
+    assert proxy.speed is None
+    assert proxy == ProxyNode(host='10.0.0.1', port=8080, created_at=proxy.created_at, updated_at=proxy.updated_at)
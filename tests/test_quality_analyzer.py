@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from src.analysis.proxy_quality_analyzer import ProxyQualityAnalyzer, QualityMetrics, QualityScore
+
+
+def _score(overall: float, dimension: float = 80.0) -> QualityScore:
+    metrics = QualityMetrics(
+        response_time=100.0, success_rate=1.0, uptime=1.0, anonymity_level=3,
+        location_score=1.0, protocol_score=1.0, stability=1.0, security=1.0,
+    )
+    return QualityScore(
+        proxy_id=f'proxy-{overall}', overall_score=overall, performance_score=dimension,
+        reliability_score=dimension, security_score=dimension, location_score=dimension,
+        metrics=metrics, timestamp=datetime.now(), recommendations=[],
+    )
+
+
+def test_analysis_report_buckets_scores(tmp_path):
+    analyzer = ProxyQualityAnalyzer(data_dir=str(tmp_path))
+    scores = [_score(value) for value in (95.0, 90.0, 89.9, 80.0, 75.0, 60.0, 59.9, 10.0)]
+
+    report = analyzer._generate_analysis_report(scores)
+
+    assert report.score_distribution == {
+        "優秀 (90-100)": 2,
+        "良好 (80-89)": 2,
+        "一般 (70-79)": 1,
+        "較差 (60-69)": 1,
+        "很差 (0-59)": 2,
+    }
+    assert list(report.score_distribution) == ["優秀 (90-100)", "良好 (80-89)", "一般 (70-79)", "較差 (60-69)", "很差 (0-59)"]
+    assert report.average_score == round(sum(s.overall_score for s in scores) / len(scores), 2)
+    assert report.top_proxies[0].overall_score == 95.0
+
+
+def test_global_recommendations_use_dimension_means(tmp_path):
+    analyzer = ProxyQualityAnalyzer(data_dir=str(tmp_path))
+
+    recommendations = analyzer._generate_global_recommendations([_score(50.0, 60.0), _score(50.0, 70.0)], 50.0)
+
+    assert len(recommendations) == 4
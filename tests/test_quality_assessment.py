@@ -0,0 +1,15 @@
+from src.proxy_manager.models import ProxyNode
+from src.proxy_manager.quality_assessment import HistoricalPerformance, _HISTORY_WINDOW
+
+
+def test_history_keeps_most_recent_window():
+    history = HistoricalPerformance(proxy=ProxyNode(host='10.0.0.1', port=8080))
+
+    for i in range(_HISTORY_WINDOW + 20):
+        history.add_record(response_time=100.0, success_rate=1.0, quality_score=float(i))
+
+    assert len(history.timestamps) == len(history.quality_scores) == _HISTORY_WINDOW
+    assert history.quality_scores[0] == 20.0
+    assert history.quality_scores[-1] == float(_HISTORY_WINDOW + 19)
+    assert history.trend_direction == 'stable'
+    assert history.avg_quality_score == sum(range(20, _HISTORY_WINDOW + 20)) / _HISTORY_WINDOW
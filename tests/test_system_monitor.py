@@ -0,0 +1,156 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from src.monitoring.system_monitor import Alert, AlertLevel, MonitoringConfig, SystemMetrics, SystemMonitor
+
+
+def _metrics(ts: datetime) -> SystemMetrics:
+    return SystemMetrics(
+        timestamp=ts, cpu_percent=10.0, memory_percent=20.0, memory_used=100, memory_total=1000,
+        disk_percent=30.0, disk_used=10, disk_total=100, network_sent=0, network_recv=0,
+        active_connections=1, proxy_count=0, api_requests_per_minute=0, error_rate=0.0,
+    )
+
+
+@pytest_asyncio.fixture
+async def make_monitor(tmp_path, monkeypatch):
+    """建立資料目錄位於 tmp_path、不執行背景監控循環的 SystemMonitor，結束時等待其關閉"""
+    monkeypatch.chdir(tmp_path)
+    monitors = []
+
+    def build(config=None):
+        monitor = SystemMonitor(config)
+        # 建構子會啟動監控循環，測試直接驅動各方法，先停止循環
+        monitor.stop_monitoring()
+        monitors.append(monitor)
+        return monitor
+
+    yield build
+    for monitor in monitors:
+        await monitor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_buffered_until_flush(make_monitor):
+    monitor = make_monitor(MonitoringConfig(metrics_flush_size=3, metrics_flush_interval=3600))
+    ts = datetime(2024, 1, 2, 3, 4, 5)
+    metrics_file = monitor.data_dir / 'metrics_20240102.json'
+
+    await monitor._save_metrics(_metrics(ts))
+    await monitor._save_metrics(_metrics(ts))
+    assert not metrics_file.exists()
+
+    await monitor._save_metrics(_metrics(ts))
+    assert len(json.loads(metrics_file.read_text(encoding='utf-8'))['metrics']) == 3
+
+    await monitor._save_metrics(_metrics(ts))
+    monitor.stop_monitoring()
+    assert len(json.loads(metrics_file.read_text(encoding='utf-8'))['metrics']) == 4
+
+
+@pytest.mark.asyncio
+async def test_hourly_rollups_average_samples(make_monitor):
+    monitor = make_monitor()
+    now = datetime.now()
+    for cpu in (10.0, 30.0):
+        sample = _metrics(now)
+        sample.cpu_percent = cpu
+        monitor._update_rollup(sample)
+
+    rollups = monitor.get_metrics_rollups(1)
+    assert len(rollups) == 1
+    assert rollups[0].count == 2
+    assert rollups[0].cpu_max == 30.0
+    assert monitor.get_metrics_averages(24)['cpu_percent'] == 20.0
+
+
+@pytest.mark.asyncio
+async def test_collect_metrics_gathers_probes(make_monitor):
+    monitor = make_monitor()
+
+    metrics = await monitor._collect_metrics()
+
+    assert metrics.proxy_count == 150
+    assert metrics.api_requests_per_minute == 25
+    assert 0 <= metrics.cpu_percent <= 100
+
+
+@pytest.mark.asyncio
+async def test_metrics_history_window_and_cleanup(make_monitor):
+    monitor = make_monitor(MonitoringConfig(data_retention_days=1))
+    now = datetime.now()
+    monitor.metrics_history = [_metrics(now - timedelta(hours=h)) for h in (48, 30, 5, 1, 0)]
+    for metrics in monitor.metrics_history:
+        monitor._update_rollup(metrics)
+
+    assert len(monitor.get_metrics_history(6)) == 3
+    monitor._cleanup_old_data()
+    assert [m.timestamp for m in monitor.metrics_history] == [now - timedelta(hours=h) for h in (5, 1, 0)]
+    assert len(monitor.hourly_rollups) == 3
+
+
+@pytest.mark.asyncio
+async def test_cleanup_drops_expired_metric_shards(make_monitor):
+    monitor = make_monitor(MonitoringConfig(data_retention_days=2))
+    today = datetime.now()
+    for days in (0, 1, 5):
+        (monitor.data_dir / f"metrics_{(today - timedelta(days=days)).strftime('%Y%m%d')}.json").write_text('{"metrics": []}')
+    (monitor.data_dir / 'metrics_notes.json').write_text('{}')
+
+    monitor._cleanup_old_data()
+
+    remaining = sorted(p.name for p in monitor.data_dir.glob('metrics_*.json'))
+    assert remaining == sorted([
+        f"metrics_{(today - timedelta(days=days)).strftime('%Y%m%d')}.json" for days in (0, 1)
+    ] + ['metrics_notes.json'])
+
+
+@pytest.mark.asyncio
+async def test_alert_callbacks_split_by_kind(make_monitor):
+    monitor = make_monitor()
+    seen = []
+
+    async def async_callback(alert):
+        seen.append(('async', alert.id))
+
+    monitor.add_alert_callback(lambda alert: seen.append(('sync', alert.id)))
+    monitor.add_alert_callback(async_callback)
+    assert len(monitor.alert_callbacks) == 1
+    assert monitor._async_alert_callbacks == [async_callback]
+
+    await monitor._handle_alert(Alert('a1', AlertLevel.WARNING, 'CPU', 'high', datetime.now()))
+
+    assert seen == [('sync', 'a1'), ('async', 'a1')]
+
+
+@pytest.mark.asyncio
+async def test_open_alert_index_follows_resolution(make_monitor):
+    monitor = make_monitor()
+    now = datetime.now()
+    await monitor._handle_alert(Alert('a1', AlertLevel.WARNING, 'CPU', 'high', now))
+    await monitor._handle_alert(Alert('a2', AlertLevel.WARNING, 'CPU', 'high', now + timedelta(seconds=1)))
+    assert [a.id for a in monitor.get_active_alerts()] == ['a1']
+
+    monitor.resolve_alert('a1')
+    await monitor._handle_alert(Alert('a3', AlertLevel.WARNING, 'CPU', 'high', now + timedelta(seconds=2)))
+
+    assert [a.id for a in monitor.get_active_alerts()] == ['a3']
+    assert [a.id for a in monitor.active_alerts] == ['a1', 'a3']
+    assert monitor.active_alerts[0].resolved is True
+
+
+@pytest.mark.asyncio
+async def test_shutdown_joins_monitoring_task(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monitor = SystemMonitor()
+    task = monitor._monitor_task
+    assert task is not None and not task.done()
+
+    await monitor.shutdown()
+
+    assert task.done()
+    assert monitor._monitor_task is None
+    assert monitor.is_running is False